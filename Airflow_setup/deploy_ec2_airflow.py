@@ -7,6 +7,7 @@ The script performs:
 2. Creates/reuses an EC2 key pair.
 3. Creates a security group opening SSH (22) and Airflow UI (8080).
 4. Provisions the IAM role + instance profile granting the EC2 host S3 access.
+   Steps 1-4 are independent and run concurrently.
 5. Launches an EC2 instance whose user data installs Airflow and syncs DAGs from the bucket.
 
 Example:
@@ -18,19 +19,75 @@ Example:
 from __future__ import annotations
 
 import argparse
+import gzip
+import hashlib
+import io
 import os
+import secrets
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from textwrap import dedent
-import uuid
 import json
 
 import boto3
-from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError, WaiterError
 
 DEFAULT_REGION = os.getenv("AWS_REGION", "eu-central-1")
 DEFAULT_AMI_ID = "ami-004e960cde33f9146"  # Ubuntu 20.04 in eu-central-1
 DEFAULT_BUCKET_NAME_PREFIX = "deploy-dag"
+DESCRIBE_CACHE_DIR = Path.home() / ".cache" / "aws_deployment"
+DESCRIBE_CACHE_TTL = 120  # seconds
+USER_DATA_GZIP_THRESHOLD = 4096  # bytes
+
+# One client config for the whole run: keep-alive pooled connections and
+# adaptive retries so throttled control-plane calls back off instead of failing.
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+)
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+AIRFLOW_INGRESS = [
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 22,
+        "ToPort": 22,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH"}],
+    },
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 8080,
+        "ToPort": 8080,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "Airflow UI"}],
+    },
+]
+# Outbound is narrowed from the default allow-all to what the boot script needs:
+# HTTP/HTTPS for apt, pip and S3. (DNS/NTP to the VPC resolver bypass SGs.)
+WEB_EGRESS = [
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 80,
+        "ToPort": 80,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTP out"}],
+    },
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 443,
+        "ToPort": 443,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTPS out"}],
+    },
+]
+DEFAULT_EGRESS = [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}]
 
 
 def parse_args() -> argparse.Namespace:
@@ -59,28 +116,79 @@ def parse_args() -> argparse.Namespace:
         help="IAM role name to create/use for the EC2 instance profile.",
     )
     parser.add_argument("--instance-name", default="pf1-airflow-ec2", help="Name tag for the instance")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the short-lived local cache of EC2 Describe* results.",
+    )
     return parser.parse_args()
 
 def generate_bucket_name() -> str:
-    suffix = uuid.uuid4().hex[:8]
+    suffix = secrets.token_hex(4)
     return f"{DEFAULT_BUCKET_NAME_PREFIX}-{suffix}"
 
-def ensure_bucket(s3_client, bucket_name: str, region: str) -> None:
-    """Create the bucket if it does not exist."""
-    try:
-        s3_client.head_bucket(Bucket=bucket_name)
-        print(f"S3 bucket '{bucket_name}' already exists.")
-        return
-    except ClientError as exc:
-        error_code = exc.response["Error"]["Code"]
-        if error_code not in ("404", "NoSuchBucket"):
-            raise
 
+def cached_describe(
+    ec2_client,
+    op_name: str,
+    result_key: str,
+    params: dict,
+    limit: int | None = None,
+    ttl: int = DESCRIBE_CACHE_TTL,
+    use_cache: bool = True,
+) -> list:
+    """Run a paginated read-only Describe* call, reusing a recent on-disk result.
+
+    Pages are fetched until ``limit`` items have been collected, so large accounts
+    never materialise the full listing. Results are keyed by region, operation,
+    parameters and limit. Empty results are never cached so that newly created
+    resources are picked up on the next run.
+    """
+    cache_key = json.dumps(
+        [ec2_client.meta.region_name, op_name, params, limit], sort_keys=True
+    )
+    cache_path = DESCRIBE_CACHE_DIR / f"{hashlib.sha256(cache_key.encode()).hexdigest()}.json"
+    if use_cache:
+        try:
+            if time.time() - cache_path.stat().st_mtime < ttl:
+                cached = json.loads(cache_path.read_text())
+                if isinstance(cached, list):
+                    return cached
+        except (OSError, ValueError):
+            # Missing, unreadable or truncated by an interrupted run: treat as a miss.
+            pass
+
+    items = []
+    pages = ec2_client.get_paginator(op_name).paginate(
+        **params, PaginationConfig={"PageSize": 100}
+    )
+    for page in pages:
+        items.extend(page[result_key])
+        if limit is not None and len(items) >= limit:
+            del items[limit:]
+            break
+    if items:
+        # Write beside the target and rename, so a concurrent or interrupted run
+        # never leaves a half-written cache file behind.
+        DESCRIBE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(items, default=str))
+        os.replace(tmp_path, cache_path)
+    return items
+
+def ensure_bucket(s3_client, bucket_name: str, region: str) -> None:
+    """Create the bucket if it does not exist (one round-trip either way)."""
     params = {"Bucket": bucket_name}
     if region != "us-east-1":
         params["CreateBucketConfiguration"] = {"LocationConstraint": region}
 
-    s3_client.create_bucket(**params)
+    try:
+        s3_client.create_bucket(**params)
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != "BucketAlreadyOwnedByYou":
+            raise
+        print(f"S3 bucket '{bucket_name}' already exists.")
+        return
     print(f"Created S3 bucket '{bucket_name}'.")
 
 
@@ -101,16 +209,38 @@ def upload_sample_dag(s3_client, bucket_name: str) -> None:
             EmptyOperator(task_id="hello_airflow")
         """
     )
-    s3_client.put_object(
-        Bucket=bucket_name,
-        Key="dags/sample_s3_dag.py",
-        Body=dag_content.encode("utf-8"),
-        ContentType="text/x-python",
+    s3_client.upload_fileobj(
+        io.BytesIO(dag_content.encode("utf-8")),
+        bucket_name,
+        "dags/sample_s3_dag.py",
+        ExtraArgs={"ContentType": "text/x-python"},
+        Config=TRANSFER_CONFIG,
     )
     print("Uploaded sample DAG to S3.")
 
 
+def prepare_dag_bucket(s3_client, bucket_name: str, region: str) -> None:
+    """Ensure the DAG bucket exists and seed it with the sample DAG."""
+    ensure_bucket(s3_client, bucket_name, region)
+    upload_sample_dag(s3_client, bucket_name)
+
+
 def create_key_pair(ec2_client, key_name: str, key_path: Path) -> None:
+    if key_path.exists():
+        # A new key pair's private key could not be saved over this file, so only
+        # reuse is possible: the key pair must already exist in AWS.
+        try:
+            ec2_client.describe_key_pairs(KeyNames=[key_name])
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "InvalidKeyPair.NotFound":
+                raise RuntimeError(
+                    f"{key_path} exists but key pair '{key_name}' does not; "
+                    "move the file or pick another key name."
+                ) from exc
+            raise
+        print(f"Key pair '{key_name}' already exists; reusing {key_path}.")
+        return
+
     try:
         response = ec2_client.create_key_pair(
             KeyName=key_name,
@@ -128,12 +258,22 @@ def create_key_pair(ec2_client, key_name: str, key_path: Path) -> None:
             return
         raise
 
-    key_path.write_text(response["KeyMaterial"])
-    key_path.chmod(0o600)
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError as exc:
+        raise RuntimeError(f"{key_path} appeared while creating key pair '{key_name}'.") from exc
+    try:
+        data = response["KeyMaterial"].encode()
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
     print(f"Wrote key pair to {key_path}")
 
 
-def ensure_security_group(ec2_client, group_name: str, vpc_id: str) -> str:
+def ensure_security_group(
+    ec2_client, group_name: str, vpc_id: str, use_cache: bool = True
+) -> str:
     try:
         response = ec2_client.create_security_group(
             GroupName=group_name,
@@ -144,42 +284,34 @@ def ensure_security_group(ec2_client, group_name: str, vpc_id: str) -> str:
             ],
         )
         group_id = response["GroupId"]
-        ec2_client.authorize_security_group_ingress(
-            GroupId=group_id,
-            IpPermissions=[
-                {
-                    "IpProtocol": "tcp",
-                    "FromPort": 22,
-                    "ToPort": 22,
-                    "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH"}],
-                },
-                {
-                    "IpProtocol": "tcp",
-                    "FromPort": 8080,
-                    "ToPort": 8080,
-                    "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "Airflow UI"}],
-                },
-            ],
-        )
+        ec2_client.authorize_security_group_ingress(GroupId=group_id, IpPermissions=AIRFLOW_INGRESS)
+        ec2_client.authorize_security_group_egress(GroupId=group_id, IpPermissions=WEB_EGRESS)
+        ec2_client.revoke_security_group_egress(GroupId=group_id, IpPermissions=DEFAULT_EGRESS)
         print(f"Created security group '{group_name}' ({group_id}).")
         return group_id
     except ClientError as exc:
         if exc.response["Error"]["Code"] == "InvalidGroup.Duplicate":
-            groups = ec2_client.describe_security_groups(
-                Filters=[
-                    {"Name": "group-name", "Values": [group_name]},
-                    {"Name": "vpc-id", "Values": [vpc_id]},
-                ]
+            groups = cached_describe(
+                ec2_client,
+                "describe_security_groups",
+                "SecurityGroups",
+                {
+                    "Filters": [
+                        {"Name": "group-name", "Values": [group_name]},
+                        {"Name": "vpc-id", "Values": [vpc_id]},
+                    ]
+                },
+                limit=1,
+                use_cache=use_cache,
             )
-            group_id = groups["SecurityGroups"][0]["GroupId"]
+            group_id = groups[0]["GroupId"]
             print(f"Security group '{group_name}' already exists ({group_id}); reusing.")
             return group_id
         raise
 
 
-def ensure_iam_role_and_profile(iam_client, role_name: str, bucket_name: str) -> str:
-    """Create or reuse an IAM role and instance profile granting S3 read access."""
-    assume_policy = {
+ASSUME_ROLE_POLICY_JSON = json.dumps(
+    {
         "Version": "2012-10-17",
         "Statement": [
             {
@@ -189,42 +321,20 @@ def ensure_iam_role_and_profile(iam_client, role_name: str, bucket_name: str) ->
             }
         ],
     }
-    try:
-        iam_client.create_role(
-            RoleName=role_name,
-            AssumeRolePolicyDocument=json.dumps(assume_policy),
-            Description="Access S3 DAG bucket for Airflow EC2 host",
-            Tags=[{"Key": "Name", "Value": role_name}],
-        )
-        print(f"Created IAM role '{role_name}'.")
-    except ClientError as exc:
-        if exc.response["Error"]["Code"] != "EntityAlreadyExists":
-            raise
-        print(f"IAM role '{role_name}' already exists; reusing.")
-
-    policy_document = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Action": ["s3:ListBucket"],
-                "Resource": f"arn:aws:s3:::{bucket_name}",
-            },
-            {
-                "Effect": "Allow",
-                "Action": ["s3:GetObject"],
-                "Resource": f"arn:aws:s3:::{bucket_name}/*",
-            },
-        ],
-    }
-    policy_name = f"{role_name}-s3-access"
-    iam_client.put_role_policy(
-        RoleName=role_name,
-        PolicyName=policy_name,
-        PolicyDocument=json.dumps(policy_document),
-    )
-    profile_name = f"{role_name}-profile"
-
+)
+# Only the bucket varies; literal JSON braces are doubled for str.format.
+S3_READ_POLICY_TEMPLATE = (
+    '{{"Version": "2012-10-17", "Statement": ['
+    '{{"Effect": "Allow", "Action": ["s3:ListBucket"], '
+    '"Resource": "arn:aws:s3:::{bucket}"}}, '
+    '{{"Effect": "Allow", "Action": ["s3:GetObject"], '
+    '"Resource": "arn:aws:s3:::{bucket}/*"}}'
+    "]}}"
+)
+
+
+def create_instance_profile(iam_client, profile_name: str) -> None:
+    """Create the instance profile, reusing it if it already exists."""
     try:
         iam_client.create_instance_profile(
             InstanceProfileName=profile_name,
@@ -236,6 +346,37 @@ def ensure_iam_role_and_profile(iam_client, role_name: str, bucket_name: str) ->
             raise
         print(f"Instance profile '{profile_name}' already exists; reusing.")
 
+
+def ensure_iam_role_and_profile(iam_client, role_name: str, bucket_name: str) -> str:
+    """Create or reuse an IAM role and instance profile granting S3 read access."""
+    profile_name = f"{role_name}-profile"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # The instance profile does not depend on the role, so create it while the
+        # role and its inline policy are being set up.
+        profile_future = executor.submit(create_instance_profile, iam_client, profile_name)
+
+        try:
+            iam_client.create_role(
+                RoleName=role_name,
+                AssumeRolePolicyDocument=ASSUME_ROLE_POLICY_JSON,
+                Description="Access S3 DAG bucket for Airflow EC2 host",
+                Tags=[{"Key": "Name", "Value": role_name}],
+            )
+            print(f"Created IAM role '{role_name}'.")
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] != "EntityAlreadyExists":
+                raise
+            print(f"IAM role '{role_name}' already exists; reusing.")
+
+        policy_name = f"{role_name}-s3-access"
+        iam_client.put_role_policy(
+            RoleName=role_name,
+            PolicyName=policy_name,
+            PolicyDocument=S3_READ_POLICY_TEMPLATE.format(bucket=bucket_name),
+        )
+        profile_future.result()
+
+    # Needs both the role and the profile to exist.
     try:
         iam_client.add_role_to_instance_profile(
             InstanceProfileName=profile_name,
@@ -249,49 +390,103 @@ def ensure_iam_role_and_profile(iam_client, role_name: str, bucket_name: str) ->
     return profile_name
 
 
+# Dedented once at import; only the bucket name varies between runs.
+USER_DATA_TEMPLATE = dedent(
+    """\
+    #!/bin/bash
+    set -xeuo pipefail
+
+    apt-get update -y
+    apt-get install -y python3 python3-venv python3-pip awscli
+
+    useradd -m airflow || true
+    install -d -o airflow -g airflow /opt/airflow
+    sudo -u airflow python3 -m venv /opt/airflow/venv
+    sudo -u airflow /opt/airflow/venv/bin/pip install --upgrade pip
+    sudo -u airflow /opt/airflow/venv/bin/pip install 'apache-airflow==2.8.1'
+
+    cat <<'EOF' >/opt/airflow/sync_dags.sh
+    #!/bin/bash
+    export AIRFLOW_HOME=/opt/airflow
+    aws s3 sync s3://{bucket_name}/dags $AIRFLOW_HOME/dags
+    EOF
+    chown airflow:airflow /opt/airflow/sync_dags.sh
+    chmod +x /opt/airflow/sync_dags.sh
+
+    cat <<'EOF' >/etc/systemd/system/airflow-web.service
+    [Unit]
+    Description=Airflow standalone service syncing DAGs from S3
+    After=network.target
+
+    [Service]
+    User=airflow
+    Group=airflow
+    Environment="AIRFLOW_HOME=/opt/airflow"
+    ExecStart=/bin/bash -c "/opt/airflow/sync_dags.sh && source /opt/airflow/venv/bin/activate && airflow standalone"
+    Restart=on-failure
+
+    [Install]
+    WantedBy=multi-user.target
+    EOF
+
+    systemctl daemon-reload
+    systemctl enable --now airflow-web.service
+    """
+)
+
+
 def build_user_data(bucket_name: str) -> str:
-    return dedent(
-        f"""\
-        #!/bin/bash
-        set -xeuo pipefail
-
-        apt-get update -y
-        apt-get install -y python3 python3-venv python3-pip awscli
-
-        useradd -m airflow || true
-        install -d -o airflow -g airflow /opt/airflow
-        sudo -u airflow python3 -m venv /opt/airflow/venv
-        sudo -u airflow /opt/airflow/venv/bin/pip install --upgrade pip
-        sudo -u airflow /opt/airflow/venv/bin/pip install 'apache-airflow==2.8.1'
-
-        cat <<'EOF' >/opt/airflow/sync_dags.sh
-        #!/bin/bash
-        export AIRFLOW_HOME=/opt/airflow
-        aws s3 sync s3://{bucket_name}/dags $AIRFLOW_HOME/dags
-        EOF
-        chown airflow:airflow /opt/airflow/sync_dags.sh
-        chmod +x /opt/airflow/sync_dags.sh
-
-        cat <<'EOF' >/etc/systemd/system/airflow-web.service
-        [Unit]
-        Description=Airflow standalone service syncing DAGs from S3
-        After=network.target
-
-        [Service]
-        User=airflow
-        Group=airflow
-        Environment="AIRFLOW_HOME=/opt/airflow"
-        ExecStart=/bin/bash -c "/opt/airflow/sync_dags.sh && source /opt/airflow/venv/bin/activate && airflow standalone"
-        Restart=on-failure
-
-        [Install]
-        WantedBy=multi-user.target
-        EOF
-
-        systemctl daemon-reload
-        systemctl enable --now airflow-web.service
-        """
-    )
+    return USER_DATA_TEMPLATE.format(bucket_name=bucket_name)
+
+
+def pack_user_data(script: str) -> str | bytes:
+    """Gzip user data once it grows past a few KB.
+
+    cloud-init recognises gzip-compressed user data and inflates it before running
+    it, so large scripts stay well clear of the 16 KB RunInstances limit and the
+    request body shrinks. Small scripts are passed through unchanged.
+    """
+    raw = script.encode("utf-8")
+    if len(raw) <= USER_DATA_GZIP_THRESHOLD:
+        return script
+    return gzip.compress(raw)
+
+
+def wait_with_backoff(
+    waiter,
+    initial_delay: float = 5,
+    max_delay: float = 15,
+    timeout: float = 600,
+    **params,
+) -> None:
+    """Run a botocore waiter, polling every 5s at first and backing off to 15s.
+
+    The stock EC2 waiters poll on a fixed 15s grid; starting shorter notices a
+    fast transition sooner while the overall time budget stays the default 10 min.
+    Each poll is a single-attempt wait, so the waiter's own acceptors still decide
+    success and terminal failure.
+    """
+    delay = initial_delay
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            waiter.wait(**params, WaiterConfig={"Delay": delay, "MaxAttempts": 1})
+            return
+        except WaiterError as exc:
+            still_pending = str(exc.kwargs.get("reason", "")).startswith("Max attempts exceeded")
+            if not still_pending or time.monotonic() + delay > deadline:
+                raise
+        time.sleep(delay)
+        delay = min(delay * 1.5, max_delay)
+
+
+def wait_for_instance(ec2_client, instance_id: str) -> None:
+    """Block until the instance is running and passes its EC2 status checks."""
+    try:
+        wait_with_backoff(ec2_client.get_waiter("instance_running"), InstanceIds=[instance_id])
+        wait_with_backoff(ec2_client.get_waiter("instance_status_ok"), InstanceIds=[instance_id])
+    except WaiterError as exc:
+        raise RuntimeError(f"Instance {instance_id} did not become healthy: {exc}") from exc
 
 
 def launch_instance(
@@ -303,7 +498,7 @@ def launch_instance(
     key_name: str,
     instance_name: str,
     iam_instance_profile_name: str,
-    user_data: str,
+    user_data: str | bytes,
 ) -> str:
     instances = ec2_resource.create_instances(
         ImageId=ami_id,
@@ -325,29 +520,51 @@ def launch_instance(
         IamInstanceProfile={"Name": iam_instance_profile_name},
         UserData=user_data,
     )
-    instance_id = instances[0].id
-    print(f"Airflow EC2 instance launch requested: {instance_id}")
+    instance = instances[0]
+    instance_id = instance.id
+    print(f"Airflow EC2 instance launch requested: {instance_id}; waiting for status checks...")
+    wait_for_instance(ec2_resource.meta.client, instance_id)
+    # Waiters poll describe_* directly; refresh the resource before reading attributes.
+    instance.reload()
+    print(f"Airflow EC2 instance {instance_id} is healthy (public IP: {instance.public_ip_address}).")
     return instance_id
 
 
 def main() -> None:
     args = parse_args()
     session = boto3.session.Session(region_name=args.region)
-    s3_client = session.client("s3")
-    ec2_client = session.client("ec2")
-    ec2_resource = session.resource("ec2")
-    iam_client = session.client("iam")
+    s3_client = session.client("s3", config=BOTO_CONFIG)
+    ec2_client = session.client("ec2", config=BOTO_CONFIG)
+    ec2_resource = session.resource("ec2", config=BOTO_CONFIG)
+    iam_client = session.client("iam", config=BOTO_CONFIG)
 
     bucket_name = args.bucket_name or generate_bucket_name()
 
-    ensure_bucket(s3_client, bucket_name, args.region)
-    upload_sample_dag(s3_client, bucket_name)
-    create_key_pair(ec2_client, args.key_name, Path(args.key_path))
-    sg_id = ensure_security_group(ec2_client, args.security_group_name, args.vpc_id)
-    instance_profile_name = ensure_iam_role_and_profile(
-        iam_client, args.iam_role_name, bucket_name
-    )
-    user_data = build_user_data(bucket_name)
+    # The bucket, key pair, security group and IAM setup are independent of each
+    # other (the IAM policy only needs the bucket name), so issue them concurrently
+    # rather than paying one AWS round-trip after another. Clients are thread-safe.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        bucket_future = executor.submit(
+            prepare_dag_bucket, s3_client, bucket_name, args.region
+        )
+        key_future = executor.submit(
+            create_key_pair, ec2_client, args.key_name, Path(args.key_path)
+        )
+        sg_future = executor.submit(
+            ensure_security_group,
+            ec2_client,
+            args.security_group_name,
+            args.vpc_id,
+            use_cache=not args.no_cache,
+        )
+        profile_future = executor.submit(
+            ensure_iam_role_and_profile, iam_client, args.iam_role_name, bucket_name
+        )
+        bucket_future.result()
+        key_future.result()
+        sg_id = sg_future.result()
+        instance_profile_name = profile_future.result()
+    user_data = pack_user_data(build_user_data(bucket_name))
 
     launch_instance(
         ec2_resource=ec2_resource,
@@ -361,12 +578,12 @@ def main() -> None:
         user_data=user_data,
     )
 
-    print("Airflow EC2 deployment submitted. Monitor AWS console for status.")
+    print("Airflow EC2 deployment complete. The UI is served on port 8080 once user data finishes.")
 
 
 if __name__ == "__main__":
     try:
         main()
-    except ClientError as error:
+    except (ClientError, RuntimeError) as error:
         print(f"AWS error: {error}", file=sys.stderr)
         raise SystemExit(1)
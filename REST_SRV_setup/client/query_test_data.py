@@ -13,6 +13,19 @@ import sys
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Module-level session so repeated calls reuse the keep-alive connection;
+# transient gateway errors from nginx/gunicorn are retried with backoff.
+SESSION = requests.Session()
+ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("http://", ADAPTER)
+SESSION.mount("https://", ADAPTER)
 
 
 def parse_args() -> argparse.Namespace:
@@ -24,7 +37,7 @@ def parse_args() -> argparse.Namespace:
 
 def fetch_test_data(server_ip: str, data_id: str) -> Any:
     url = f"http://{server_ip}/test_data"
-    response = requests.get(url, params={"data_id": data_id}, timeout=10)
+    response = SESSION.get(url, params={"data_id": data_id}, timeout=10)
     response.raise_for_status()
     return response.json()
 
@@ -11,18 +11,64 @@ Example:
 from __future__ import annotations
 
 import argparse
+import gzip
+import hashlib
+import json
 import os
 import sys
+import time
 from pathlib import Path
 from textwrap import dedent
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import ClientError, WaiterError
 
 DEFAULT_REGION = os.getenv("AWS_REGION", "eu-central-1")
 DEFAULT_VPC_ID = os.getenv("VPC_ID", "")
 DEFAULT_AMI_ID = "ami-004e960cde33f9146"  # Ubuntu 20.04 LTS in eu-central-1
 SERVER_APP_PATH = Path(__file__).parent / "server" / "app.py"
+DESCRIBE_CACHE_DIR = Path.home() / ".cache" / "aws_deployment"
+DESCRIBE_CACHE_TTL = 120  # seconds
+USER_DATA_GZIP_THRESHOLD = 4096  # bytes
+
+# Shared by the EC2 client and resource; adaptive retries absorb API throttling.
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+)
+
+REST_INGRESS = [
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 22,
+        "ToPort": 22,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH"}],
+    },
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 80,
+        "ToPort": 80,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTP"}],
+    },
+]
+# Replaces the default allow-all egress; apt and pip only need HTTP/HTTPS.
+WEB_EGRESS = [
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 80,
+        "ToPort": 80,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTP out"}],
+    },
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 443,
+        "ToPort": 443,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTPS out"}],
+    },
+]
+DEFAULT_EGRESS = [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}]}]
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,6 +87,11 @@ def parse_args() -> argparse.Namespace:
         help="Security group allowing SSH + HTTP",
     )
     parser.add_argument("--instance-name", default="pf1-rest-instance", help="Name tag")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the short-lived local cache of EC2 Describe* results.",
+    )
     args = parser.parse_args()
 
     if not args.vpc_id:
@@ -57,8 +108,62 @@ def load_app_source() -> str:
     return content + "\n"
 
 
+def cached_describe(
+    ec2_client,
+    op_name: str,
+    result_key: str,
+    params: dict,
+    limit: int | None = None,
+    ttl: int = DESCRIBE_CACHE_TTL,
+    use_cache: bool = True,
+) -> list:
+    """Paginated Describe* call (stopping at ``limit`` items) cached on disk for ``ttl`` seconds."""
+    cache_key = json.dumps(
+        [ec2_client.meta.region_name, op_name, params, limit], sort_keys=True
+    )
+    cache_path = DESCRIBE_CACHE_DIR / f"{hashlib.sha256(cache_key.encode()).hexdigest()}.json"
+    if use_cache:
+        try:
+            if time.time() - cache_path.stat().st_mtime < ttl:
+                cached = json.loads(cache_path.read_text())
+                if isinstance(cached, list):
+                    return cached
+        except (OSError, ValueError):
+            pass
+
+    items = []
+    pages = ec2_client.get_paginator(op_name).paginate(
+        **params, PaginationConfig={"PageSize": 100}
+    )
+    for page in pages:
+        items.extend(page[result_key])
+        if limit is not None and len(items) >= limit:
+            del items[limit:]
+            break
+    if items:
+        DESCRIBE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(items, default=str))
+        os.replace(tmp_path, cache_path)
+    return items
+
+
 def create_key_pair(ec2_client, key_name: str, key_path: Path) -> None:
     """Create (or reuse) a key pair and persist the private key."""
+    if key_path.exists():
+        # Never create a key pair whose private key has nowhere to go.
+        try:
+            ec2_client.describe_key_pairs(KeyNames=[key_name])
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "InvalidKeyPair.NotFound":
+                raise RuntimeError(
+                    f"{key_path} already exists but key pair '{key_name}' is not in AWS; "
+                    "move the file aside or use a different key name."
+                ) from exc
+            raise
+        print(f"Key pair '{key_name}' already exists; reusing {key_path}.")
+        return
+
     try:
         response = ec2_client.create_key_pair(
             KeyName=key_name,
@@ -82,25 +187,42 @@ def create_key_pair(ec2_client, key_name: str, key_path: Path) -> None:
             return
         raise
 
-    key_path.write_text(response["KeyMaterial"])
-    key_path.chmod(0o600)
+    # Created with mode 0600 in one step so the PEM is never readable by others;
+    # O_EXCL refuses to clobber an existing key file.
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError as exc:
+        raise RuntimeError(f"{key_path} was created concurrently; key pair '{key_name}' not saved.") from exc
+    try:
+        pem = response["KeyMaterial"].encode()
+        # os.write may write fewer bytes than requested.
+        while pem:
+            pem = pem[os.write(fd, pem):]
+    finally:
+        os.close(fd)
     print(f"Created key pair '{key_name}' and wrote PEM to {key_path}")
 
 
-def find_public_subnet(ec2_client, vpc_id: str) -> str:
+def find_public_subnet(ec2_client, vpc_id: str, use_cache: bool = True) -> str:
     """Return the subnet ID tagged Tier=public (expects exactly one)."""
-    response = ec2_client.describe_subnets(
-        Filters=[
-            {"Name": "vpc-id", "Values": [vpc_id]},
-            {"Name": "tag:Tier", "Values": ["public"]},
-        ]
+    subnets = cached_describe(
+        ec2_client,
+        "describe_subnets",
+        "Subnets",
+        {
+            "Filters": [
+                {"Name": "vpc-id", "Values": [vpc_id]},
+                {"Name": "tag:Tier", "Values": ["public"]},
+            ]
+        },
+        limit=2,  # enough to detect an ambiguous match
+        use_cache=use_cache,
     )
-    subnets = response["Subnets"]
     if not subnets:
         raise ValueError("No subnet tagged Tier=public found.")
     if len(subnets) > 1:
         raise ValueError(
-            f"Expected single public subnet but found {len(subnets)}. "
+            "Expected single public subnet but found more than one. "
             "Tag only one with Tier=public or specify a subnet explicitly."
         )
     subnet_id = subnets[0]["SubnetId"]
@@ -108,7 +230,9 @@ def find_public_subnet(ec2_client, vpc_id: str) -> str:
     return subnet_id
 
 
-def ensure_security_group(ec2_client, group_name: str, vpc_id: str) -> str:
+def ensure_security_group(
+    ec2_client, group_name: str, vpc_id: str, use_cache: bool = True
+) -> str:
     """Create or fetch a SG allowing SSH and HTTP from anywhere."""
     try:
         response = ec2_client.create_security_group(
@@ -123,99 +247,138 @@ def ensure_security_group(ec2_client, group_name: str, vpc_id: str) -> str:
             ],
         )
         sg_id = response["GroupId"]
-        ec2_client.authorize_security_group_ingress(
-            GroupId=sg_id,
-            IpPermissions=[
-                {
-                    "IpProtocol": "tcp",
-                    "FromPort": 22,
-                    "ToPort": 22,
-                    "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH"}],
-                },
-                {
-                    "IpProtocol": "tcp",
-                    "FromPort": 80,
-                    "ToPort": 80,
-                    "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTP"}],
-                },
-            ],
-        )
+        ec2_client.authorize_security_group_ingress(GroupId=sg_id, IpPermissions=REST_INGRESS)
+        ec2_client.authorize_security_group_egress(GroupId=sg_id, IpPermissions=WEB_EGRESS)
+        ec2_client.revoke_security_group_egress(GroupId=sg_id, IpPermissions=DEFAULT_EGRESS)
         print(f"Created security group '{group_name}' ({sg_id})")
         return sg_id
     except ClientError as exc:
         if exc.response["Error"]["Code"] == "InvalidGroup.Duplicate":
-            groups = ec2_client.describe_security_groups(
-                Filters=[
-                    {"Name": "group-name", "Values": [group_name]},
-                    {"Name": "vpc-id", "Values": [vpc_id]},
-                ]
+            groups = cached_describe(
+                ec2_client,
+                "describe_security_groups",
+                "SecurityGroups",
+                {
+                    "Filters": [
+                        {"Name": "group-name", "Values": [group_name]},
+                        {"Name": "vpc-id", "Values": [vpc_id]},
+                    ]
+                },
+                limit=1,
+                use_cache=use_cache,
             )
-            sg_id = groups["SecurityGroups"][0]["GroupId"]
+            sg_id = groups[0]["GroupId"]
             print(f"Security group '{group_name}' already exists ({sg_id}); reusing.")
             return sg_id
         raise
 
 
+# Dedented once at import. Literal braces (nginx config) are doubled for str.format.
+USER_DATA_TEMPLATE = dedent(
+    """\
+    #!/bin/bash
+    set -xeuo pipefail
+
+    apt-get update -y
+    apt-get install -y python3 python3-venv python3-pip nginx
+
+    install -d -o ubuntu -g ubuntu /opt/rest_app
+    cat <<'EOF' >/opt/rest_app/app.py
+    {app_source}
+    EOF
+    chown ubuntu:ubuntu /opt/rest_app/app.py
+
+    sudo -u ubuntu python3 -m venv /opt/rest_app/venv
+    sudo -u ubuntu /opt/rest_app/venv/bin/pip install --upgrade pip
+    sudo -u ubuntu /opt/rest_app/venv/bin/pip install flask gunicorn gevent
+
+    # gunicorn reads its default worker count from WEB_CONCURRENCY (2 * cores + 1).
+    echo "WEB_CONCURRENCY=$((2 * $(nproc) + 1))" >/opt/rest_app/gunicorn.env
+
+    cat <<'EOF' >/etc/systemd/system/restapp.service
+    [Unit]
+    Description=Gunicorn instance to serve Flask REST app
+    After=network.target
+
+    [Service]
+    User=ubuntu
+    Group=www-data
+    WorkingDirectory=/opt/rest_app
+    Environment="PATH=/opt/rest_app/venv/bin"
+    EnvironmentFile=/opt/rest_app/gunicorn.env
+    ExecStart=/opt/rest_app/venv/bin/gunicorn --worker-class gevent --worker-connections 1000 --keep-alive 5 --bind unix:/opt/rest_app/restapp.sock app:app
+
+    [Install]
+    WantedBy=multi-user.target
+    EOF
+
+    systemctl daemon-reload
+    systemctl enable --now restapp.service
+
+    cat <<'EOF' >/etc/nginx/sites-available/restapp
+    server {{
+        listen 80;
+        server_name _;
+
+        location / {{
+            proxy_pass http://unix:/opt/rest_app/restapp.sock;
+            proxy_set_header Host $host;
+            proxy_set_header X-Real-IP $remote_addr;
+            proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+            proxy_set_header X-Forwarded-Proto $scheme;
+        }}
+    }}
+    EOF
+
+    ln -sf /etc/nginx/sites-available/restapp /etc/nginx/sites-enabled/restapp
+    rm -f /etc/nginx/sites-enabled/default
+    systemctl restart nginx
+    """
+)
+
+
 def build_user_data(app_source: str) -> str:
     """Return cloud-init script to install Flask/Gunicorn/Nginx."""
-    script = dedent(
-        """\
-        #!/bin/bash
-        set -xeuo pipefail
-
-        apt-get update -y
-        apt-get install -y python3 python3-venv python3-pip nginx
-
-        install -d -o ubuntu -g ubuntu /opt/rest_app
-        cat <<'EOF' >/opt/rest_app/app.py
-        APP_SOURCE_PLACEHOLDER
-        EOF
-        chown ubuntu:ubuntu /opt/rest_app/app.py
-
-        sudo -u ubuntu python3 -m venv /opt/rest_app/venv
-        sudo -u ubuntu /opt/rest_app/venv/bin/pip install --upgrade pip
-        sudo -u ubuntu /opt/rest_app/venv/bin/pip install flask gunicorn
-
-        cat <<'EOF' >/etc/systemd/system/restapp.service
-        [Unit]
-        Description=Gunicorn instance to serve Flask REST app
-        After=network.target
-
-        [Service]
-        User=ubuntu
-        Group=www-data
-        WorkingDirectory=/opt/rest_app
-        Environment="PATH=/opt/rest_app/venv/bin"
-        ExecStart=/opt/rest_app/venv/bin/gunicorn --bind unix:/opt/rest_app/restapp.sock app:app
-
-        [Install]
-        WantedBy=multi-user.target
-        EOF
-
-        systemctl daemon-reload
-        systemctl enable --now restapp.service
-
-        cat <<'EOF' >/etc/nginx/sites-available/restapp
-        server {
-            listen 80;
-            server_name _;
-
-            location / {
-                proxy_pass http://unix:/opt/rest_app/restapp.sock;
-                proxy_set_header Host $host;
-                proxy_set_header X-Real-IP $remote_addr;
-                proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
-                proxy_set_header X-Forwarded-Proto $scheme;
-            }
-        }
-        EOF
+    return USER_DATA_TEMPLATE.format(app_source=app_source)
+
+
+def pack_user_data(script: str) -> str | bytes:
+    """Return the script gzip-compressed (inflated by cloud-init) when it exceeds the threshold."""
+    raw = script.encode("utf-8")
+    if len(raw) <= USER_DATA_GZIP_THRESHOLD:
+        return script
+    return gzip.compress(raw)
+
+
+def wait_with_backoff(
+    waiter,
+    initial_delay: float = 5,
+    max_delay: float = 15,
+    timeout: float = 600,
+    **params,
+) -> None:
+    """Poll a botocore waiter every 5s at first, backing off to 15s, for up to 10 min."""
+    delay = initial_delay
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            waiter.wait(**params, WaiterConfig={"Delay": delay, "MaxAttempts": 1})
+            return
+        except WaiterError as exc:
+            still_pending = str(exc.kwargs.get("reason", "")).startswith("Max attempts exceeded")
+            if not still_pending or time.monotonic() + delay > deadline:
+                raise
+        time.sleep(delay)
+        delay = min(delay * 1.5, max_delay)
 
-        ln -sf /etc/nginx/sites-available/restapp /etc/nginx/sites-enabled/restapp
-        rm -f /etc/nginx/sites-enabled/default
-        systemctl restart nginx
-        """
-    )
-    return script.replace("APP_SOURCE_PLACEHOLDER", app_source)
+
+def wait_for_instance(ec2_client, instance_id: str) -> None:
+    """Block until the instance is running and passes its EC2 status checks."""
+    try:
+        wait_with_backoff(ec2_client.get_waiter("instance_running"), InstanceIds=[instance_id])
+        wait_with_backoff(ec2_client.get_waiter("instance_status_ok"), InstanceIds=[instance_id])
+    except WaiterError as exc:
+        raise RuntimeError(f"Instance {instance_id} did not become healthy: {exc}") from exc
 
 
 def launch_instance(
@@ -226,7 +389,7 @@ def launch_instance(
     sg_id: str,
     key_name: str,
     instance_name: str,
-    user_data: str,
+    user_data: str | bytes,
 ) -> str:
     """Launch EC2 instance with provided configuration."""
     instances = ec2_resource.create_instances(
@@ -252,8 +415,12 @@ def launch_instance(
         UserData=user_data,
     )
 
-    instance_id = instances[0].id
-    print(f"REST instance launch requested: {instance_id}")
+    instance = instances[0]
+    instance_id = instance.id
+    print(f"REST instance launch requested: {instance_id}; waiting for status checks...")
+    wait_for_instance(ec2_resource.meta.client, instance_id)
+    instance.reload()
+    print(f"REST instance {instance_id} is healthy (public IP: {instance.public_ip_address}).")
     return instance_id
 
 
@@ -262,14 +429,17 @@ def main() -> None:
     key_path = Path(args.key_path)
 
     session = boto3.session.Session(region_name=args.region)
-    ec2_client = session.client("ec2")
-    ec2_resource = session.resource("ec2")
+    ec2_client = session.client("ec2", config=BOTO_CONFIG)
+    ec2_resource = session.resource("ec2", config=BOTO_CONFIG)
 
     create_key_pair(ec2_client, args.key_name, key_path)
-    subnet_id = find_public_subnet(ec2_client, args.vpc_id)
-    sg_id = ensure_security_group(ec2_client, args.security_group_name, args.vpc_id)
+    use_cache = not args.no_cache
+    subnet_id = find_public_subnet(ec2_client, args.vpc_id, use_cache=use_cache)
+    sg_id = ensure_security_group(
+        ec2_client, args.security_group_name, args.vpc_id, use_cache=use_cache
+    )
     app_source = load_app_source()
-    user_data = build_user_data(app_source)
+    user_data = pack_user_data(build_user_data(app_source))
 
     launch_instance(
         ec2_resource=ec2_resource,
@@ -282,12 +452,12 @@ def main() -> None:
         user_data=user_data,
     )
 
-    print("REST service EC2 provisioning submitted. Check AWS console for status.")
+    print("REST service EC2 instance is up. Nginx answers on port 80 once user data finishes.")
 
 
 if __name__ == "__main__":
     try:
         main()
-    except (ClientError, ValueError) as exc:
+    except (ClientError, RuntimeError, ValueError) as exc:
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)
@@ -1,7 +1,28 @@
-from flask import Flask, jsonify, request
+import json
+
+from flask import Flask, Response, jsonify, request
 
 app = Flask(__name__)
 
+TEST_DATA = {
+    "1": {
+        "id": "1",
+        "name": "Alice Example",
+        "address": "123 Cloud Lane, Internet City",
+    },
+    "2": {
+        "id": "2",
+        "name": "Bob Sample",
+        "address": "987 Server Way, Compute Town",
+    },
+}
+# The catalog is fixed, so serialize each payload once at import instead of per request.
+# Compact, sorted and newline-terminated, byte-for-byte what jsonify produces.
+TEST_DATA_JSON = {
+    data_id: (json.dumps(payload, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8")
+    for data_id, payload in TEST_DATA.items()
+}
+
 
 @app.get("/")
 def hello():
@@ -11,19 +32,8 @@ def hello():
 @app.get("/test_data")
 def test_data():
     data_id = request.args.get("data_id")
-    if data_id == "1":
-        payload = {
-            "id": "1",
-            "name": "Alice Example",
-            "address": "123 Cloud Lane, Internet City",
-        }
-    elif data_id == "2":
-        payload = {
-            "id": "2",
-            "name": "Bob Sample",
-            "address": "987 Server Way, Compute Town",
-        }
-    else:
+    body = TEST_DATA_JSON.get(data_id)
+    if body is None:
         payload = {"error": "Unknown data_id", "data_id": data_id}
         return jsonify(payload), 404
-    return jsonify(payload)
+    return Response(body, mimetype="application/json")
@@ -13,13 +13,34 @@ import io
 import os
 import sys
 from datetime import datetime
+from typing import BinaryIO
 
 import boto3
 import pandas as pd
+from boto3.s3.transfer import TransferConfig
+from botocore.compat import HAS_CRT
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 DEFAULT_REGION = os.getenv("AWS_REGION", "eu-central-1")
 
+# Keep-alive connections are reused across the upload/download calls below.
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+)
+# Objects above 8 MiB are split into parts transferred concurrently; smaller
+# payloads still go out as a single request. With boto3[crt] installed the
+# transfers run on the aws-crt S3 client (native HTTP, SigV4 and part
+# scheduling) instead of the pure-Python threaded manager.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    preferred_transfer_client="crt" if HAS_CRT else "classic",
+)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Upload and read a sample CSV file in S3.")
@@ -27,44 +48,56 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--object-key", default="sample-data.csv", help="Key for the CSV object.")
     parser.add_argument(
         "--dataframe-key",
-        default="sample-dataframe.csv",
-        help="Object key used when uploading the pandas dataframe.",
+        default=None,
+        help="Object key used when uploading the pandas dataframe "
+        "(default: sample-dataframe.<format>).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("parquet", "csv"),
+        default="parquet",
+        help="Serialization format for the dataframe object (default: %(default)s).",
     )
     parser.add_argument("--region", default=DEFAULT_REGION, help="AWS region for the S3 client.")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.dataframe_key is None:
+        args.dataframe_key = f"sample-dataframe.{args.format}"
+    return args
 
 
 def build_sample_csv() -> bytes:
+    timestamp = datetime.utcnow().isoformat()
     rows = [
-        ["id", "name", "timestamp"],
-        ["1", "alpha", datetime.utcnow().isoformat()],
-        ["2", "beta", datetime.utcnow().isoformat()],
+        ("id", "name", "timestamp"),
+        (1, "alpha", timestamp),
+        (2, "beta", timestamp),
     ]
-    buffer = io.StringIO()
-    for row in rows:
-        buffer.write(",".join(row) + "\n")
-    return buffer.getvalue().encode("utf-8")
+    # join straight into bytes; no text buffer and no separate encode pass
+    return b"\n".join(b",".join(str(cell).encode("utf-8") for cell in row) for row in rows) + b"\n"
 
 
 def upload_csv(s3_client, bucket_name: str, object_key: str, data: bytes) -> None:
-    s3_client.put_object(
-        Bucket=bucket_name,
-        Key=object_key,
-        Body=data,
-        ContentType="text/csv",
+    s3_client.upload_fileobj(
+        io.BytesIO(data),
+        bucket_name,
+        object_key,
+        ExtraArgs={"ContentType": "text/csv"},
+        Config=TRANSFER_CONFIG,
     )
     print(f"Uploaded {object_key} to bucket {bucket_name}.")
 
 
-def download_csv(s3_client, bucket_name: str, object_key: str) -> str:
+def download_csv(s3_client, bucket_name: str, object_key: str, dest: BinaryIO) -> None:
+    """Stream the object body into ``dest`` in 1 MiB chunks instead of buffering it whole."""
     response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-    body = response["Body"].read().decode("utf-8")
+    for chunk in response["Body"].iter_chunks(chunk_size=1024 * 1024):
+        dest.write(chunk)
+    dest.flush()
     print(f"Downloaded {object_key} from bucket {bucket_name}.")
-    return body
 
 
-def upload_df(s3_client, bucket_name: str, object_key: str) -> None:
-    """Create a dummy pandas DataFrame and upload it as CSV to S3."""
+def upload_df(s3_client, bucket_name: str, object_key: str, fmt: str = "parquet") -> None:
+    """Create a dummy pandas DataFrame and upload it to S3 as Parquet (or CSV)."""
     df = pd.DataFrame(
         {
             "id": [1, 2, 3],
@@ -72,26 +105,38 @@ def upload_df(s3_client, bucket_name: str, object_key: str) -> None:
             "value": [10.5, 42.0, 100.1],
         }
     )
-    # holds a unicode (python) string buffer
-    buffer = io.StringIO()
-    # write the DataFrame to the buffer 
-    df.to_csv(buffer, index=False)
-
-    # convert the buffer to a byte stream (utf-8) and upload to S3
-    s3_client.put_object(
-        Bucket=bucket_name,
-        Key=object_key,
-        Body=buffer.getvalue().encode("utf-8"),
-        ContentType="text/csv",
+    # serialize straight into a byte buffer; no intermediate unicode copy
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(buffer, engine="pyarrow", compression="zstd", index=False)
+        content_type = "application/vnd.apache.parquet"
+    else:
+        df.to_csv(buffer, index=False, encoding="utf-8")
+        content_type = "text/csv"
+    buffer.seek(0)
+
+    s3_client.upload_fileobj(
+        buffer,
+        bucket_name,
+        object_key,
+        ExtraArgs={"ContentType": content_type},
+        Config=TRANSFER_CONFIG,
     )
-    print(f"Uploaded DataFrame to {bucket_name}/{object_key}.")
-
-
-def download_df(s3_client, bucket_name: str, object_key: str) -> pd.DataFrame:
-    """Download the DataFrame CSV from S3 and load into pandas."""
-    response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-    body = response["Body"].read().decode("utf-8")
-    df = pd.read_csv(io.StringIO(body))
+    print(f"Uploaded DataFrame to {bucket_name}/{object_key} as {fmt}.")
+
+
+def download_df(s3_client, bucket_name: str, object_key: str, fmt: str = "parquet") -> pd.DataFrame:
+    """Download the DataFrame object from S3 and load into pandas."""
+    if fmt == "parquet":
+        # Parquet needs a seekable file (the footer is read first).
+        buffer = io.BytesIO()
+        s3_client.download_fileobj(bucket_name, object_key, buffer)
+        buffer.seek(0)
+        df = pd.read_parquet(buffer, engine="pyarrow")
+    else:
+        # CSV can be parsed directly off the streaming HTTP body.
+        response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
+        df = pd.read_csv(response["Body"])
     print(f"Downloaded DataFrame from {bucket_name}/{object_key}.")
     return df
 
@@ -99,21 +144,20 @@ def download_df(s3_client, bucket_name: str, object_key: str) -> pd.DataFrame:
 def main() -> None:
     args = parse_args()
     session = boto3.session.Session(region_name=args.region)
-    s3_client = session.client("s3")
+    s3_client = session.client("s3", config=BOTO_CONFIG)
 
     csv_bytes = build_sample_csv()
 
     try:
         upload_csv(s3_client, args.bucket_name, args.object_key, csv_bytes)
-        contents = download_csv(s3_client, args.bucket_name, args.object_key)
-        upload_df(s3_client, args.bucket_name, args.dataframe_key)
-        df = download_df(s3_client, args.bucket_name, args.dataframe_key)
+        print("CSV contents retrieved:", flush=True)
+        download_csv(s3_client, args.bucket_name, args.object_key, sys.stdout.buffer)
+        upload_df(s3_client, args.bucket_name, args.dataframe_key, args.format)
+        df = download_df(s3_client, args.bucket_name, args.dataframe_key, args.format)
     except ClientError as exc:
         print(f"S3 operation failed: {exc}", file=sys.stderr)
         raise SystemExit(1)
 
-    print("CSV contents retrieved:")
-    print(contents.strip())
     print("DataFrame downloaded from S3:")
     print(df)
 
@@ -13,10 +13,17 @@ import os
 import sys
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 DEFAULT_REGION = os.getenv("AWS_REGION", "eu-central-1")
 
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Create an S3 bucket.")
@@ -27,7 +34,7 @@ def parse_args() -> argparse.Namespace:
 
 def create_bucket(bucket_name: str, region: str) -> None:
     session = boto3.session.Session(region_name=region)
-    s3_client = session.client("s3")
+    s3_client = session.client("s3", config=BOTO_CONFIG)
 
     params = {"Bucket": bucket_name}
     if region != "us-east-1":
@@ -36,6 +43,9 @@ def create_bucket(bucket_name: str, region: str) -> None:
     try:
         s3_client.create_bucket(**params)
     except ClientError as exc:
+        if exc.response["Error"]["Code"] == "BucketAlreadyOwnedByYou":
+            print(f"S3 bucket '{bucket_name}' already exists in your account; reusing.")
+            return
         print(f"Error creating bucket: {exc}", file=sys.stderr)
         raise SystemExit(1)
 
@@ -0,0 +1,39 @@
+"""
+Shared boto3 session/client cache for the scripts in ec2_instance/.
+
+Building a Session resolves credentials and every client loads its service model,
+so both are memoized per region; boto3 clients are thread-safe and can be reused.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+import boto3
+from botocore.config import Config
+
+# Profiles that assume a role should call STS in the session's region rather than
+# the global us-east-1 endpoint. Must be set before the first Session is built.
+os.environ.setdefault("AWS_STS_REGIONAL_ENDPOINTS", "regional")
+
+BOTO_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=32,
+    tcp_keepalive=True,
+)
+
+
+@lru_cache(maxsize=None)
+def get_session(region: str | None = None) -> boto3.session.Session:
+    return boto3.session.Session(region_name=region)
+
+
+@lru_cache(maxsize=None)
+def get_client(service: str, region: str | None = None):
+    return get_session(region).client(service, config=BOTO_CONFIG)
+
+
+@lru_cache(maxsize=None)
+def get_resource(service: str, region: str | None = None):
+    return get_session(region).resource(service, config=BOTO_CONFIG)
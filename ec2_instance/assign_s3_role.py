@@ -7,6 +7,8 @@ Example:
     python ec2_instance/assign_s3_role.py \
         --instance-id i-0123456789abcdef0 \
         --bucket-name my-demo-bucket-123
+
+Progress goes to stderr; stdout gets a single JSON line with the instance, role and profile ARN.
 """
 
 from __future__ import annotations
@@ -14,10 +16,63 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-import time
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
+from botocore.waiter import WaiterModel, create_waiter_with_client
+
+from _aws import get_client
+
+# EC2 has no built-in waiter for profile associations, so define one that polls
+# DescribeIamInstanceProfileAssociations until the association reports "associated".
+# Callers pass AssociationIds, so older associations of the instance are not matched.
+ASSOCIATION_WAITER_MODEL = WaiterModel(
+    {
+        "version": 2,
+        "waiters": {
+            "IamInstanceProfileAssociated": {
+                "operation": "DescribeIamInstanceProfileAssociations",
+                "delay": 3,
+                "maxAttempts": 20,
+                "acceptors": [
+                    {
+                        "matcher": "pathAll",
+                        "argument": "IamInstanceProfileAssociations[].State",
+                        "expected": "associated",
+                        "state": "success",
+                    },
+                    {
+                        "matcher": "pathAny",
+                        "argument": "IamInstanceProfileAssociations[].State",
+                        "expected": "disassociated",
+                        "state": "failure",
+                    },
+                ],
+            }
+        },
+    }
+)
+
+ASSUME_ROLE_POLICY_JSON = json.dumps(
+    {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"Service": "ec2.amazonaws.com"},
+                "Action": "sts:AssumeRole",
+            }
+        ],
+    }
+)
+# Braces are doubled for str.format; {bucket} is the only placeholder.
+S3_ACCESS_POLICY_TEMPLATE = (
+    '{{"Version": "2012-10-17", "Statement": ['
+    '{{"Effect": "Allow", "Action": ["s3:ListBucket"], '
+    '"Resource": "arn:aws:s3:::{bucket}"}}, '
+    '{{"Effect": "Allow", "Action": ["s3:GetObject", "s3:PutObject", "s3:DeleteObject"], '
+    '"Resource": "arn:aws:s3:::{bucket}/*"}}'
+    "]}}"
+)
 
 
 def parse_args() -> argparse.Namespace:
@@ -42,114 +97,135 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _role_exists(iam_client, role_name: str) -> bool:
+    try:
+        iam_client.get_role(RoleName=role_name)
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != "NoSuchEntity":
+            raise
+        return False
+    return True
+
+
+def _get_instance_profile(iam_client, profile_name: str) -> dict | None:
+    """Return the instance profile description, or None if it does not exist yet."""
+    try:
+        return iam_client.get_instance_profile(InstanceProfileName=profile_name)["InstanceProfile"]
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != "NoSuchEntity":
+            raise
+        return None
+
+
+def _role_policy_matches(iam_client, role_name: str, policy_name: str, policy_json: str) -> bool:
+    """True if the role already carries an inline policy equivalent to ``policy_json``."""
+    try:
+        current = iam_client.get_role_policy(RoleName=role_name, PolicyName=policy_name)
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != "NoSuchEntity":
+            raise
+        return False
+    # botocore URL-decodes and parses PolicyDocument, so compare canonical JSON.
+    return json.dumps(current["PolicyDocument"], sort_keys=True) == json.dumps(
+        json.loads(policy_json), sort_keys=True
+    )
+
+
 def ensure_role_and_profile(
     iam_client,
     role_name: str,
     profile_name: str,
     bucket_name: str,
 ) -> str:
-    assume_policy = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Principal": {"Service": "ec2.amazonaws.com"},
-                "Action": "sts:AssumeRole",
-            }
-        ],
-    }
-
-    try:
+    if _role_exists(iam_client, role_name):
+        print(f"IAM role '{role_name}' already exists; reusing.", file=sys.stderr)
+    else:
         iam_client.create_role(
             RoleName=role_name,
-            AssumeRolePolicyDocument=json.dumps(assume_policy),
+            AssumeRolePolicyDocument=ASSUME_ROLE_POLICY_JSON,
             Description="EC2 S3 access role",
             Tags=[{"Key": "Name", "Value": role_name}],
         )
-        print(f"Created IAM role '{role_name}'.")
-    except ClientError as exc:
-        if exc.response["Error"]["Code"] != "EntityAlreadyExists":
-            raise
-        print(f"IAM role '{role_name}' already exists; reusing.")
+        print(f"Created IAM role '{role_name}'.", file=sys.stderr)
 
-    policy_document = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Action": ["s3:ListBucket"],
-                "Resource": f"arn:aws:s3:::{bucket_name}",
-            },
-            {
-                "Effect": "Allow",
-                "Action": ["s3:GetObject", "s3:PutObject", "s3:DeleteObject"],
-                "Resource": f"arn:aws:s3:::{bucket_name}/*",
-            },
-        ],
-    }
+    policy_json = S3_ACCESS_POLICY_TEMPLATE.format(bucket=bucket_name)
     policy_name = f"{role_name}-s3-access"
-    iam_client.put_role_policy(
-        RoleName=role_name,
-        PolicyName=policy_name,
-        PolicyDocument=json.dumps(policy_document),
-    )
+    if _role_policy_matches(iam_client, role_name, policy_name, policy_json):
+        print(f"Inline policy '{policy_name}' is up to date.", file=sys.stderr)
+    else:
+        iam_client.put_role_policy(
+            RoleName=role_name,
+            PolicyName=policy_name,
+            PolicyDocument=policy_json,
+        )
 
-    try:
+    profile = _get_instance_profile(iam_client, profile_name)
+    if profile is None:
         iam_client.create_instance_profile(
             InstanceProfileName=profile_name,
             Tags=[{"Key": "Name", "Value": profile_name}],
         )
-        print(f"Created instance profile '{profile_name}'.")
-    except ClientError as exc:
-        if exc.response["Error"]["Code"] != "EntityAlreadyExists":
-            raise
-        print(f"Instance profile '{profile_name}' already exists; reusing.")
-
-    try:
+        print(f"Created instance profile '{profile_name}'.", file=sys.stderr)
+        attached_roles = []
+    else:
+        print(f"Instance profile '{profile_name}' already exists; reusing.", file=sys.stderr)
+        attached_roles = [role["RoleName"] for role in profile["Roles"]]
+
+    if role_name in attached_roles:
+        print(f"Role '{role_name}' is already attached to profile '{profile_name}'.", file=sys.stderr)
+    elif attached_roles:
+        # An instance profile holds at most one role.
+        print(
+            f"Instance profile '{profile_name}' already has a role; using existing attachment.",
+            file=sys.stderr,
+        )
+    else:
         iam_client.add_role_to_instance_profile(
             InstanceProfileName=profile_name,
             RoleName=role_name,
         )
-        print(f"Attached role '{role_name}' to profile '{profile_name}'.")
-    except ClientError as exc:
-        if exc.response["Error"]["Code"] != "LimitExceeded":
-            raise
-        print(f"Instance profile '{profile_name}' already has a role; using existing attachment.")
+        print(f"Attached role '{role_name}' to profile '{profile_name}'.", file=sys.stderr)
 
     return profile_name
 
 
-def wait_for_instance_profile(iam_client, profile_name: str, attempts: int = 2, delay: int = 30) -> str:
+def wait_for_instance_profile(iam_client, profile_name: str, attempts: int = 20, delay: int = 3) -> str:
     """Wait for the instance profile to become available and return its ARN."""
-    for attempt in range(attempts):
-        try:
-            profile = iam_client.get_instance_profile(InstanceProfileName=profile_name)["InstanceProfile"]
-            return profile["Arn"]
-        except ClientError as exc:
-            if exc.response["Error"]["Code"] != "NoSuchEntity":
-                raise
-            if attempt == attempts - 1:
-                raise RuntimeError(
-                    f"Instance profile '{profile_name}' not available after {attempts} checks."
-                )
-            print(f"Instance profile '{profile_name}' not yet available; waiting {delay} seconds...")
-            time.sleep(delay)
-    raise RuntimeError(f"Instance profile '{profile_name}' not available.")
+    try:
+        iam_client.get_waiter("instance_profile_exists").wait(
+            InstanceProfileName=profile_name,
+            WaiterConfig={"Delay": delay, "MaxAttempts": attempts},
+        )
+    except WaiterError as exc:
+        raise RuntimeError(
+            f"Instance profile '{profile_name}' not available after {attempts} checks."
+        ) from exc
+    profile = iam_client.get_instance_profile(InstanceProfileName=profile_name)["InstanceProfile"]
+    return profile["Arn"]
 
 
 def attach_profile_to_instance(ec2_client, instance_id: str, profile_arn: str) -> None:
-    ec2_client.associate_iam_instance_profile(
+    response = ec2_client.associate_iam_instance_profile(
         IamInstanceProfile={"Arn": profile_arn},
         InstanceId=instance_id,
     )
-    print(f"Associated instance profile with EC2 instance {instance_id}.")
+    association_id = response["IamInstanceProfileAssociation"]["AssociationId"]
+    waiter = create_waiter_with_client(
+        "IamInstanceProfileAssociated", ASSOCIATION_WAITER_MODEL, ec2_client
+    )
+    try:
+        waiter.wait(AssociationIds=[association_id])
+    except WaiterError as exc:
+        raise RuntimeError(
+            f"Instance profile association for {instance_id} did not become active."
+        ) from exc
+    print(f"Associated instance profile with EC2 instance {instance_id}.", file=sys.stderr)
 
 
 def main() -> None:
     args = parse_args()
-    session = boto3.session.Session(region_name=args.region)
-    iam_client = session.client("iam")
-    ec2_client = session.client("ec2")
+    iam_client = get_client("iam", args.region)
+    ec2_client = get_client("ec2", args.region)
 
     try:
         profile_name = ensure_role_and_profile(
@@ -164,7 +240,12 @@ def main() -> None:
         print(f"AWS error: {exc}", file=sys.stderr)
         raise SystemExit(1)
 
-    print("S3 access role assigned successfully.")
+    print("S3 access role assigned successfully.", file=sys.stderr)
+    print(json.dumps({
+        "instance_id": args.instance_id,
+        "role_name": args.role_name,
+        "instance_profile_arn": profile_arn,
+    }))
 
 
 if __name__ == "__main__":
@@ -15,6 +15,8 @@ Example:
         --key-name pf1-ec2-key \\
         --security-group-name pf1-ec2-sg
 
+Progress is reported on stderr and the resulting IDs are printed to stdout as one JSON object.
+
 AWS credentials and region must already be configured via environment variables,
 credential files, or an instance profile.
 """
@@ -22,19 +24,28 @@ credential files, or an instance profile.
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from textwrap import dedent
 
-import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
+
+from _aws import get_client, get_resource
 
 DEFAULT_REGION = os.getenv("AWS_REGION", "eu-central-1")
 DEFAULT_VPC_ID = os.getenv("VPC_ID", "")
 DEFAULT_SUBNET_ID = os.getenv("SUBNET_ID", "")
 DEFAULT_AMI_ID = "ami-004e960cde33f9146"  # ubuntu/images/hvm-ssd/ubuntu-focal-20.04-amd64-server-20230420 (eu-central-1) 
 
+# Predicates that identify "the public subnet" among the VPC's subnets, keyed by --subnet-selector.
+SUBNET_SELECTORS = {
+    "tag-tier": lambda subnet: {"Key": "Tier", "Value": "public"} in subnet.get("Tags", []),
+    "public-ip": lambda subnet: subnet.get("MapPublicIpOnLaunch", False),
+}
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Create an EC2 instance with SSH access.")
@@ -46,6 +57,13 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_SUBNET_ID or None,
         help="Optional subnet ID; if omitted the script looks for the public subnet in the VPC.",
     )
+    parser.add_argument(
+        "--subnet-selector",
+        choices=sorted(SUBNET_SELECTORS),
+        default="tag-tier",
+        help="How to find the public subnet when --subnet-id is omitted: by the Tier=public tag "
+        "or by MapPublicIpOnLaunch (default: %(default)s).",
+    )
     parser.add_argument("--key-name", default="pf1-ec2-key", help="Name for the EC2 key pair.")
     parser.add_argument("--key-path", default="pf1-ec2-key.pem", help="Where to write the private key.")
     parser.add_argument("--security-group-name", default="pf1-public-sg", help="Security group name.")
@@ -53,8 +71,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--instance-name", default="pf1-ec2-instance", help="Tag Name for the instance.")
     parser.add_argument(
         "--test-s3-bucket",
-        required=True,
-        help="S3 bucket used by the on-instance test script.",
+        default=None,
+        help="S3 bucket used by the on-instance test script; the script is not installed if omitted.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate the launch with a DryRun RunInstances call and exit without creating anything.",
     )
     args = parser.parse_args()
 
@@ -65,6 +88,21 @@ def parse_args() -> argparse.Namespace:
 
 def create_key_pair(ec2_client, key_name: str, key_path: Path) -> None:
     """Create a new key pair and write the private key to disk."""
+    if key_path.exists():
+        # The existing file can only be used with an existing key pair; creating a
+        # new one here would leave its private key with nowhere to be written.
+        try:
+            ec2_client.describe_key_pairs(KeyNames=[key_name])
+        except ClientError as error:
+            if error.response["Error"]["Code"] == "InvalidKeyPair.NotFound":
+                raise RuntimeError(
+                    f"{key_path} exists but key pair '{key_name}' does not. "
+                    "Move the file or choose another --key-name."
+                ) from error
+            raise
+        print(f"Key pair '{key_name}' already exists. Using {key_path}.", file=sys.stderr)
+        return
+
     try:
         response = ec2_client.create_key_pair(
             KeyName=key_name,
@@ -79,37 +117,59 @@ def create_key_pair(ec2_client, key_name: str, key_path: Path) -> None:
         )
     except ClientError as error:
         if error.response["Error"]["Code"] == "InvalidKeyPair.Duplicate":
-            print(f"Key pair '{key_name}' already exists. Using existing key pair.")
+            print(f"Key pair '{key_name}' already exists. Using existing key pair.", file=sys.stderr)
             return
+        raise
 
-    key_material = response["KeyMaterial"]
-    key_path.write_text(key_material)
-    key_path.chmod(0o600)
-    print(f"Created key pair '{key_name}' and wrote private key to {key_path}")
+    key_material = response["KeyMaterial"].encode()
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError as error:
+        raise RuntimeError(f"{key_path} appeared before key pair '{key_name}' could be saved.") from error
+    try:
+        while key_material:
+            key_material = key_material[os.write(fd, key_material):]
+    finally:
+        os.close(fd)
+    print(f"Created key pair '{key_name}' and wrote private key to {key_path}", file=sys.stderr)
     
     
 
-def find_public_subnet(ec2_client, vpc_id: str) -> str:
-    """
-    Return the ID of the single subnet tagged Tier=public within the VPC.
-    Raises ValueError if zero or multiple such subnets are found.
-    """
-    response = ec2_client.describe_subnets(
+@lru_cache(maxsize=32)
+def list_subnets(ec2_client, vpc_id: str) -> tuple:
+    """All subnets in the VPC, fetched once and filtered locally by the callers."""
+    paginator = ec2_client.get_paginator("describe_subnets")
+    pages = paginator.paginate(Filters=[{"Name": "vpc-id", "Values": [vpc_id]}])
+    return tuple(subnet for page in pages for subnet in page["Subnets"])
+
+
+@lru_cache(maxsize=32)
+def _describe_sgs(ec2_client, vpc_id: str, group_name: str) -> tuple:
+    response = ec2_client.describe_security_groups(
         Filters=[
+            {"Name": "group-name", "Values": [group_name]},
             {"Name": "vpc-id", "Values": [vpc_id]},
-            {"Name": "tag:Tier", "Values": ["public"]},
         ]
     )
-    subnets = response["Subnets"]
+    return tuple(response["SecurityGroups"])
+
+
+def find_public_subnet(ec2_client, vpc_id: str, selector: str = "tag-tier") -> str:
+    """
+    Return the ID of the single public subnet within the VPC, matched by ``selector``
+    (see SUBNET_SELECTORS). Raises ValueError if zero or multiple such subnets are found.
+    """
+    is_public = SUBNET_SELECTORS[selector]
+    subnets = [subnet for subnet in list_subnets(ec2_client, vpc_id) if is_public(subnet)]
     if not subnets:
-        raise ValueError("No subnet tagged Tier=public found in the VPC.")
+        raise ValueError(f"No public subnet found in the VPC (selector: {selector}).")
     if len(subnets) > 1:
         raise ValueError(
             f"Expected a single public subnet but found {len(subnets)}. "
             "Pass --subnet-id explicitly to disambiguate."
         )
     subnet_id = subnets[0]["SubnetId"]
-    print(f"Identified public subnet: {subnet_id}")
+    print(f"Identified public subnet: {subnet_id}", file=sys.stderr)
     return subnet_id
 
 
@@ -118,23 +178,23 @@ def get_security_group_id(ec2_client, group_name: str, vpc_id: str) -> str:
     Look up the ID of the named security group within the VPC.
     Raises ValueError if not found.
     """
-    response = ec2_client.describe_security_groups(
-        Filters=[
-            {"Name": "group-name", "Values": [group_name]},
-            {"Name": "vpc-id", "Values": [vpc_id]},
-        ]
-    )
-    groups = response["SecurityGroups"]
+    groups = _describe_sgs(ec2_client, vpc_id, group_name)
     if not groups:
         raise ValueError(f"Security group '{group_name}' not found in VPC {vpc_id}.")
     group_id = groups[0]["GroupId"]
-    print(f"Using security group '{group_name}' ({group_id})")
+    print(f"Using security group '{group_name}' ({group_id})", file=sys.stderr)
     return group_id
 
 
-def build_user_data(bucket_name: str) -> str:
-    """Create user-data script that installs boto3 and writes the S3 test helper."""
-    s3_test_script = f"""#!/usr/bin/env python3
+# Rendered with str.format: {bucket_name} is the only field, every other brace is doubled.
+USER_DATA_TEMPLATE = """#!/bin/bash
+set -xeuo pipefail
+
+apt-get update -y
+apt-get install -y python3-boto3 python3-venv python3-pip
+
+cat <<'PYCODE' >/home/ubuntu/s3_bucket_test.py
+#!/usr/bin/env python3
 import argparse
 import uuid
 from datetime import datetime
@@ -171,22 +231,17 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
+
+PYCODE
+chown ubuntu:ubuntu /home/ubuntu/s3_bucket_test.py
+chmod +x /home/ubuntu/s3_bucket_test.py
 """
 
-    return dedent(
-        f"""#!/bin/bash
-        set -xeuo pipefail
 
-        apt-get update -y
-        apt-get install -y python3-boto3 python3-venv python3-pip
+def build_user_data(bucket_name: str) -> str:
+    """Create user-data script that installs boto3 and writes the S3 test helper."""
+    return USER_DATA_TEMPLATE.format(bucket_name=bucket_name)
 
-        cat <<'PYCODE' >/home/ubuntu/s3_bucket_test.py
-{s3_test_script}
-PYCODE
-        chown ubuntu:ubuntu /home/ubuntu/s3_bucket_test.py
-        chmod +x /home/ubuntu/s3_bucket_test.py
-        """
-    )
 
 def launch_instance(
     ec2_resource,
@@ -197,8 +252,12 @@ def launch_instance(
     instance_type: str,
     instance_name: str,
     user_data: str | None = None,
-) -> str:
-    """Launch a single EC2 instance and return its ID."""
+    dry_run: bool = False,
+) -> str | None:
+    """
+    Launch a single EC2 instance, wait until it is running and return its ID.
+    With ``dry_run`` only check that the launch would be authorized and return None.
+    """
     params = dict(
         ImageId=ami_id,
         InstanceType=instance_type,
@@ -223,10 +282,28 @@ def launch_instance(
     if user_data:
         params["UserData"] = user_data
 
+    if dry_run:
+        try:
+            ec2_resource.meta.client.run_instances(**params, DryRun=True)
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] != "DryRunOperation":
+                raise
+        print("Dry run succeeded: the instance launch request is valid and authorized.", file=sys.stderr)
+        return None
+
     instances = ec2_resource.create_instances(**params)
 
     instance_id = instances[0].id
-    print(f"Instance launch initiated. Instance ID: {instance_id}")
+    print(f"Instance launch initiated. Instance ID: {instance_id}", file=sys.stderr)
+
+    try:
+        ec2_resource.meta.client.get_waiter("instance_running").wait(
+            InstanceIds=[instance_id],
+            WaiterConfig={"Delay": 5, "MaxAttempts": 40},
+        )
+    except WaiterError as exc:
+        raise RuntimeError(f"Instance {instance_id} did not reach the running state.") from exc
+    print(f"Instance {instance_id} is running.", file=sys.stderr)
     return instance_id
 
 
@@ -234,15 +311,24 @@ def main() -> None:
     args = parse_args()
     key_path = Path(args.key_path)
 
-    session = boto3.session.Session(region_name=args.region)
-    ec2_client = session.client("ec2")
-    ec2_resource = session.resource("ec2")
-
-    create_key_pair(ec2_client, args.key_name, key_path)
-    subnet_id = args.subnet_id or find_public_subnet(ec2_client, args.vpc_id)
-    group_id = get_security_group_id(ec2_client, args.security_group_name, args.vpc_id)
+    ec2_client = get_client("ec2", args.region)
+    ec2_resource = get_resource("ec2", args.region)
+
+    if args.dry_run:
+        print(f"Dry run: not creating key pair '{args.key_name}'.", file=sys.stderr)
+    else:
+        create_key_pair(ec2_client, args.key_name, key_path)
+    # The subnet and security group lookups are independent reads; run them side by side.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        group_future = executor.submit(
+            get_security_group_id, ec2_client, args.security_group_name, args.vpc_id
+        )
+        subnet_id = args.subnet_id or find_public_subnet(
+            ec2_client, args.vpc_id, args.subnet_selector
+        )
+        group_id = group_future.result()
 
-    user_data = build_user_data(args.test_s3_bucket)
+    user_data = build_user_data(args.test_s3_bucket) if args.test_s3_bucket else None
 
     instance_id = launch_instance(
         ec2_resource=ec2_resource,
@@ -253,14 +339,21 @@ def main() -> None:
         instance_type=args.instance_type,
         instance_name=args.instance_name,
         user_data=user_data,
+        dry_run=args.dry_run,
     )
+    if instance_id is not None:
+        print(
+            f"EC2 instance {instance_id} provisioned. It can now be passed to assign_s3_role.py.",
+            file=sys.stderr,
+        )
 
-    print("EC2 instance provisioning submitted. Monitor progress in the AWS console or with describe-instances.")
+    # The one machine-readable line on stdout; instance_id is null for --dry-run.
+    print(json.dumps({"instance_id": instance_id, "subnet_id": subnet_id, "security_group_id": group_id}))
 
 
 if __name__ == "__main__":
     try:
         main()
-    except ClientError as error:
+    except (ClientError, RuntimeError) as error:
         print(f"AWS error: {error}", file=sys.stderr)
         raise SystemExit(1)
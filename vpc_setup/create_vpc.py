@@ -1,175 +1,575 @@
+#!/usr/bin/env python3
+"""
+Provision the pf1 VPC: DNS-enabled VPC, internet gateway, a public and a private
+subnet, a public route table, a public security group and a NAT gateway.
+
+Independent API calls are issued concurrently once their inputs exist:
+1. VPC, availability zone lookup
+2. DNS support + DNS hostnames, internet gateway
+3. All subnets listed in SUBNETS (tagged at creation)
+4. Elastic IP + NAT gateway in the public subnet, public route table, public
+   security group, public IP mapping
+
+Each resource is looked up first (by Name tag, CIDR, attachment or subnet) and
+reused if present, so re-running the script does not create duplicates.
+
+Progress is reported on stderr; stdout receives a single JSON object with the
+created resource IDs.
+
+Example:
+    python vpc_setup/create_vpc.py
+"""
+
+from __future__ import annotations
+
+import functools
+import ipaddress
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, WaiterError
 
-# Create VPC
-ec2 = boto3.client("ec2", region_name="eu-central-1") 
+REGION = "eu-central-1"
+VPC_CIDR = "10.0.0.0/16"
+# (CIDR, index into the region's AZ ID list, Name tag, Tier tag). The first entry is
+# the public subnet that receives the route table, NAT gateway and public IPs.
+SUBNETS = [
+    ("10.0.1.0/24", 0, "pf1-subnet-1", "public"),
+    ("10.0.2.0/24", 0, "pf1-subnet-2", "private"),
+]
+# Inbound rules of pf1-public-sg.
+PUBLIC_INGRESS = [
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 22,
+        "ToPort": 22,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH from internet"}],
+    },
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 80,
+        "ToPort": 80,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTP from internet"}],
+    },
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 443,
+        "ToPort": 443,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTPS from internet"}],
+    },
+]
 
-response = ec2.create_vpc(
-    CidrBlock="10.0.0.0/16",
-    TagSpecifications=[
-        {
-            "ResourceType": "vpc",
-            "Tags": [
-                {"Key": "Name", "Value": "pf1-vpc"}
-            ]
-        }
-    ]
-)
+# Zone IDs (e.g. "euc1-az1") name the same physical zone in every account, unlike
+# zone names, whose letters are shuffled per account. Pinning them here skips the
+# DescribeAvailabilityZones call; leave empty to use the region's usable zones.
+AZ_IDS: list[str] = []
 
-vpc_id = response["Vpc"]["VpcId"]
-print("VPC created:", vpc_id)
+# A region's zone list practically never changes, so it is kept on disk for a day
+# and in memory for the rest of the process.
+AZ_CACHE_DIR = Path.home() / ".cache" / "aws_deployment"
+AZ_CACHE_TTL = 24 * 60 * 60  # seconds
+_AZS: dict[str, list[str]] = {}
 
-# Enable DNS support and hostnames
-ec2.modify_vpc_attribute(
-    VpcId=vpc_id,
-    EnableDnsSupport={"Value": True}
+# Adaptive retries throttle client-side when the concurrent calls below hit
+# RequestLimitExceeded; the pool is sized above the thread count. Short connect/read
+# timeouts turn a stalled control-plane call into a quick retry instead of a hang.
+BOTO_CONFIG = Config(
+    region_name=REGION,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
 )
+SESSION = boto3.session.Session(region_name=REGION)
 
-ec2.modify_vpc_attribute(
-    VpcId=vpc_id,
-    EnableDnsHostnames={"Value": True}
-)
+LOGGER = logging.getLogger(__name__)
 
-print("DNS enabled")
+# Error codes EC2 (and the other control-plane APIs) use to signal throttling.
+THROTTLING_ERROR_CODES = {
+    "RequestLimitExceeded",
+    "Throttling",
+    "ThrottlingException",
+    "RequestThrottled",
+    "EC2ThrottledException",
+}
+THROTTLE_RETRY_ATTEMPTS = 5
+THROTTLE_BACKOFF_BASE = 1.0  # seconds
+THROTTLE_BACKOFF_CAP = 20.0  # seconds
 
-# Create and attach an Internet Gateway so the VPC can access the internet
-igw_response = ec2.create_internet_gateway(
-    TagSpecifications=[
-        {
-            "ResourceType": "internet-gateway",
-            "Tags": [
-                {"Key": "Name", "Value": "pf1-igw"}
-            ]
-        }
-    ]
-)
-igw_id = igw_response["InternetGateway"]["InternetGatewayId"]
-ec2.attach_internet_gateway(InternetGatewayId=igw_id, VpcId=vpc_id)
-print("Internet Gateway created and attached:", igw_id)
-
-# Get available AZs
-azs = ec2.describe_availability_zones()["AvailabilityZones"]
-
-# Create first subnet in one AZ with a specific CIDR block (subset of VPC CIDR)
-subnet_1 = ec2.create_subnet(
-    VpcId=vpc_id,
-    CidrBlock="10.0.1.0/24",
-    AvailabilityZone=azs[0]["ZoneName"]
-)
 
-# Create second subnet in same AZ with a different CIDR block
-subnet_2 = ec2.create_subnet(
-    VpcId=vpc_id,
-    CidrBlock="10.0.2.0/24",
-    AvailabilityZone=azs[0]["ZoneName"]
-)
+def start_log_listener() -> QueueListener:
+    """
+    Route LOGGER through a queue so worker threads never block on stderr; a single
+    listener thread does the writing. Stop the returned listener to flush it.
+    """
+    log_queue = queue.SimpleQueue()
+    LOGGER.addHandler(QueueHandler(log_queue))
+    LOGGER.setLevel(logging.INFO)
+    LOGGER.propagate = False
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stderr))
+    listener.start()
+    return listener
 
-subnet_1_id = subnet_1["Subnet"]["SubnetId"]
-subnet_2_id = subnet_2["Subnet"]["SubnetId"]
 
-print("Subnets:", subnet_1_id, subnet_2_id)
+def retry_on_throttle(func):
+    """
+    Wrap an API call so throttling errors that outlast botocore's own retries are
+    retried with full-jitter exponential backoff. Wrap individual calls rather than
+    multi-step helpers, so a retry never repeats a step that already succeeded.
+    """
 
-ec2.create_tags(
-    Resources=[subnet_1_id],
-    Tags=[
-        {"Key": "Name", "Value": "pf1-subnet-1"},
-        {"Key": "Tier", "Value": "public"},
-    ],
-)
-ec2.create_tags(
-    Resources=[subnet_2_id],
-    Tags=[
-        {"Key": "Name", "Value": "pf1-subnet-2"},
-        {"Key": "Tier", "Value": "private"},
-    ],
-)
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(THROTTLE_RETRY_ATTEMPTS):
+            try:
+                return func(*args, **kwargs)
+            except ClientError as exc:
+                code = exc.response["Error"]["Code"]
+                if code not in THROTTLING_ERROR_CODES or attempt == THROTTLE_RETRY_ATTEMPTS - 1:
+                    raise
+                delay = random.uniform(0, min(THROTTLE_BACKOFF_CAP, THROTTLE_BACKOFF_BASE * 2**attempt))
+                LOGGER.info("%s throttled (%s); retrying in %.1fs", func.__name__, code, delay)
+                time.sleep(delay)
 
-# Create a route table for the public subnet and route internet traffic via the IGW
-public_rt = ec2.create_route_table(
-    VpcId=vpc_id,
-    TagSpecifications=[
-        {
-            "ResourceType": "route-table",
-            "Tags": [
-                {"Key": "Name", "Value": "pf1-public-rt"}
-            ]
+    return wrapper
+
+
+def find_existing(ec2, op_name: str, result_key: str, filters: list) -> dict | None:
+    """Return the first resource matching ``filters`` from a Describe* call, if any."""
+    items = getattr(ec2, op_name)(Filters=filters)[result_key]
+    return items[0] if items else None
+
+
+def call_allowing_duplicate(func, duplicate_code: str, **params) -> None:
+    """Make a mutating call, treating ``duplicate_code`` (already in place) as success."""
+    try:
+        retry_on_throttle(func)(**params)
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != duplicate_code:
+            raise
+
+
+def wait_until(ec2, waiter_name: str, what: str, **params) -> None:
+    """Run an EC2 waiter with a short poll interval, raising RuntimeError on timeout."""
+    try:
+        ec2.get_waiter(waiter_name).wait(**params, WaiterConfig={"Delay": 2, "MaxAttempts": 15})
+    except WaiterError as exc:
+        raise RuntimeError(f"{what} did not become available: {exc}") from exc
+
+
+def create_vpc(ec2) -> str:
+    existing = find_existing(
+        ec2, "describe_vpcs", "Vpcs", [{"Name": "tag:Name", "Values": ["pf1-vpc"]}]
+    )
+    if existing:
+        LOGGER.info("VPC pf1-vpc already exists; reusing: %s", existing["VpcId"])
+        return existing["VpcId"]
+
+    response = retry_on_throttle(ec2.create_vpc)(
+        CidrBlock=VPC_CIDR,
+        TagSpecifications=[
+            {
+                "ResourceType": "vpc",
+                "Tags": [
+                    {"Key": "Name", "Value": "pf1-vpc"}
+                ]
+            }
+        ]
+    )
+    vpc_id = response["Vpc"]["VpcId"]
+    # Attribute changes and subnet creation can race a VPC that is still pending.
+    wait_until(ec2, "vpc_available", f"VPC {vpc_id}", VpcIds=[vpc_id])
+    LOGGER.info("VPC created: %s", vpc_id)
+    return vpc_id
+
+
+def enable_dns_support(ec2, vpc_id: str) -> None:
+    retry_on_throttle(ec2.modify_vpc_attribute)(
+        VpcId=vpc_id,
+        EnableDnsSupport={"Value": True}
+    )
+
+
+def enable_dns_hostnames(ec2, vpc_id: str) -> None:
+    retry_on_throttle(ec2.modify_vpc_attribute)(
+        VpcId=vpc_id,
+        EnableDnsHostnames={"Value": True}
+    )
+
+
+def create_igw(ec2, vpc_id: str) -> str:
+    """Create and attach an Internet Gateway so the VPC can access the internet."""
+    existing = find_existing(
+        ec2,
+        "describe_internet_gateways",
+        "InternetGateways",
+        [{"Name": "attachment.vpc-id", "Values": [vpc_id]}],
+    )
+    if existing:
+        LOGGER.info("Internet Gateway already attached; reusing: %s", existing["InternetGatewayId"])
+        return existing["InternetGatewayId"]
+
+    igw_response = retry_on_throttle(ec2.create_internet_gateway)(
+        TagSpecifications=[
+            {
+                "ResourceType": "internet-gateway",
+                "Tags": [
+                    {"Key": "Name", "Value": "pf1-igw"}
+                ]
+            }
+        ]
+    )
+    igw_id = igw_response["InternetGateway"]["InternetGatewayId"]
+    retry_on_throttle(ec2.attach_internet_gateway)(InternetGatewayId=igw_id, VpcId=vpc_id)
+    LOGGER.info("Internet Gateway created and attached: %s", igw_id)
+    return igw_id
+
+
+def read_az_cache(cache_path: Path) -> list[str] | None:
+    """Return the cached zone IDs if the file is fresh and well-formed, else None."""
+    try:
+        if time.time() - cache_path.stat().st_mtime >= AZ_CACHE_TTL:
+            return None
+        zones = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        # Missing, unreadable or truncated (e.g. an interrupted run): refetch.
+        return None
+    if not zones or not isinstance(zones, list) or not all(isinstance(zone, str) for zone in zones):
+        return None
+    return zones
+
+
+def write_az_cache(cache_path: Path, zones: list[str]) -> None:
+    """Replace the cache file atomically so readers never see a partial write."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        AZ_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(zones))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only home (e.g. inside Lambda): keep only the in-memory copy.
+        tmp_path.unlink(missing_ok=True)
+
+
+def get_azs(ec2) -> list[str]:
+    """
+    Return the zone IDs of the usable (available, opted-in) zones of the client's
+    region, or AZ_IDS when pinned.
+    """
+    region = ec2.meta.region_name
+    if region in _AZS:
+        return _AZS[region]
+
+    cache_path = AZ_CACHE_DIR / f"az-ids-{region}.json"
+    zones = list(AZ_IDS) or read_az_cache(cache_path)
+    if not zones:
+        response = ec2.describe_availability_zones(
+            AllAvailabilityZones=False,
+            Filters=[
+                {"Name": "region-name", "Values": [region]},
+                {"Name": "zone-type", "Values": ["availability-zone"]},
+                {"Name": "state", "Values": ["available"]},
+                {"Name": "opt-in-status", "Values": ["opt-in-not-required", "opted-in"]},
+            ],
+        )
+        zones = [zone["ZoneId"] for zone in response["AvailabilityZones"]]
+        if zones:
+            write_az_cache(cache_path, zones)
+    _AZS[region] = zones
+    return zones
+
+
+def create_subnet(ec2, vpc_id: str, cidr: str, az_id: str, name: str, tier: str) -> str:
+    """Create a tagged subnet in the given zone ID with a CIDR block that is a subset of the VPC CIDR."""
+    existing = find_existing(
+        ec2,
+        "describe_subnets",
+        "Subnets",
+        [
+            {"Name": "vpc-id", "Values": [vpc_id]},
+            {"Name": "cidr-block", "Values": [cidr]},
+        ],
+    )
+    if existing:
+        return existing["SubnetId"]
+
+    subnet = retry_on_throttle(ec2.create_subnet)(
+        VpcId=vpc_id,
+        CidrBlock=cidr,
+        AvailabilityZoneId=az_id,
+        TagSpecifications=[
+            {
+                "ResourceType": "subnet",
+                "Tags": [
+                    {"Key": "Name", "Value": name},
+                    {"Key": "Tier", "Value": tier},
+                ]
+            }
+        ]
+    )
+    return subnet["Subnet"]["SubnetId"]
+
+
+def create_public_route_table(ec2, vpc_id: str, igw_id: str, subnet_id: str) -> str:
+    """Create a route table for the public subnet and route internet traffic via the IGW."""
+    existing = find_existing(
+        ec2,
+        "describe_route_tables",
+        "RouteTables",
+        [
+            {"Name": "vpc-id", "Values": [vpc_id]},
+            {"Name": "tag:Name", "Values": ["pf1-public-rt"]},
+        ],
+    )
+    if existing:
+        LOGGER.info("Public route table already exists; reusing: %s", existing["RouteTableId"])
+        route_table = existing
+    else:
+        route_table = retry_on_throttle(ec2.create_route_table)(
+            VpcId=vpc_id,
+            TagSpecifications=[
+                {
+                    "ResourceType": "route-table",
+                    "Tags": [
+                        {"Key": "Name", "Value": "pf1-public-rt"}
+                    ]
+                }
+            ],
+        )["RouteTable"]
+    public_rt_id = route_table["RouteTableId"]
+
+    # A run that stopped right after creating the table leaves it without its
+    # default route or association, so both are checked on reuse as well.
+    if not any(route.get("DestinationCidrBlock") == "0.0.0.0/0" for route in route_table.get("Routes", [])):
+        call_allowing_duplicate(
+            ec2.create_route,
+            "RouteAlreadyExists",
+            RouteTableId=public_rt_id,
+            DestinationCidrBlock="0.0.0.0/0",
+            GatewayId=igw_id,
+        )
+    if not any(assoc.get("SubnetId") == subnet_id for assoc in route_table.get("Associations", [])):
+        call_allowing_duplicate(
+            ec2.associate_route_table,
+            "Resource.AlreadyAssociated",
+            RouteTableId=public_rt_id,
+            SubnetId=subnet_id,
+        )
+    LOGGER.info("Public route table in place and associated with subnet_1: %s", public_rt_id)
+    return public_rt_id
+
+
+def create_public_sg(ec2, vpc_id: str) -> str:
+    """Security group for resources in subnet_1 to allow public access (SSH/HTTP/HTTPS)."""
+    existing = find_existing(
+        ec2,
+        "describe_security_groups",
+        "SecurityGroups",
+        [
+            {"Name": "vpc-id", "Values": [vpc_id]},
+            {"Name": "group-name", "Values": ["pf1-public-sg"]},
+        ],
+    )
+    if existing:
+        LOGGER.info("Public security group already exists; reusing: %s", existing["GroupId"])
+        public_sg_id = existing["GroupId"]
+        present = {
+            (perm["IpProtocol"], perm.get("FromPort"), perm.get("ToPort"), ip_range["CidrIp"])
+            for perm in existing.get("IpPermissions", [])
+            for ip_range in perm.get("IpRanges", [])
         }
-    ],
-)
-public_rt_id = public_rt["RouteTable"]["RouteTableId"]
-ec2.create_route(
-    RouteTableId=public_rt_id,
-    DestinationCidrBlock="0.0.0.0/0",
-    GatewayId=igw_id,
-)
-ec2.associate_route_table(
-    RouteTableId=public_rt_id,
-    SubnetId=subnet_1_id,
-)
-print("Public route table created and associated with subnet_1:", public_rt_id)
-
-# Security group for resources in subnet_1 to allow public access (SSH/HTTP/HTTPS)
-public_sg = ec2.create_security_group(
-    GroupName="pf1-public-sg",
-    Description="Public access for subnet_1 resources",
-    VpcId=vpc_id,
-    TagSpecifications=[
-        {
-            "ResourceType": "security-group",
-            "Tags": [
-                {"Key": "Name", "Value": "pf1-public-sg"}
+    else:
+        public_sg = retry_on_throttle(ec2.create_security_group)(
+            GroupName="pf1-public-sg",
+            Description="Public access for subnet_1 resources",
+            VpcId=vpc_id,
+            TagSpecifications=[
+                {
+                    "ResourceType": "security-group",
+                    "Tags": [
+                        {"Key": "Name", "Value": "pf1-public-sg"}
+                    ]
+                }
             ]
-        }
+        )
+        public_sg_id = public_sg["GroupId"]
+        LOGGER.info("Public security group created: %s", public_sg_id)
+        present = set()
+
+    # Only the missing rules are sent: one duplicate fails the whole request.
+    missing = [
+        perm for perm in PUBLIC_INGRESS
+        if (perm["IpProtocol"], perm["FromPort"], perm["ToPort"], perm["IpRanges"][0]["CidrIp"]) not in present
     ]
-)
-public_sg_id = public_sg["GroupId"]
-ec2.authorize_security_group_ingress(
-    GroupId=public_sg_id,
-    IpPermissions=[
-        {
-            "IpProtocol": "tcp",
-            "FromPort": 22,
-            "ToPort": 22,
-            "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "SSH from internet"}],
-        },
-        {
-            "IpProtocol": "tcp",
-            "FromPort": 80,
-            "ToPort": 80,
-            "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTP from internet"}],
-        },
-        {
-            "IpProtocol": "tcp",
-            "FromPort": 443,
-            "ToPort": 443,
-            "IpRanges": [{"CidrIp": "0.0.0.0/0", "Description": "HTTPS from internet"}],
-        },
-    ],
-)
-print("Public security group created:", public_sg_id)
+    if missing:
+        call_allowing_duplicate(
+            ec2.authorize_security_group_ingress,
+            "InvalidPermission.Duplicate",
+            GroupId=public_sg_id,
+            IpPermissions=missing,
+        )
+    return public_sg_id
 
-ec2.modify_subnet_attribute(
-    SubnetId=subnet_1_id,
-    MapPublicIpOnLaunch={"Value": True}
-)
-print("Configured subnet_1 for public IP assignment.")
-
-# deploy a NAT Gateway in subnet_1
-eip_1 = ec2.allocate_address(Domain="vpc")
-nat_1 = ec2.create_nat_gateway(
-    SubnetId=subnet_1_id,
-    AllocationId=eip_1["AllocationId"],
-    TagSpecifications=[
-        {
-            "ResourceType": "natgateway",
-            "Tags": [
-                {"Key": "Name", "Value": "pf1-nat-1"}
+
+def enable_public_ip(ec2, subnet_id: str) -> None:
+    retry_on_throttle(ec2.modify_subnet_attribute)(
+        SubnetId=subnet_id,
+        MapPublicIpOnLaunch={"Value": True}
+    )
+    LOGGER.info("Configured subnet_1 for public IP assignment.")
+
+
+def create_nat_gateway(ec2, subnet_id: str) -> str:
+    """Deploy a NAT Gateway (with a new Elastic IP) in the given (public) subnet."""
+    # DescribeNatGateways takes "Filter", not "Filters", so find_existing does not apply.
+    existing = ec2.describe_nat_gateways(
+        Filter=[
+            {"Name": "subnet-id", "Values": [subnet_id]},
+            {"Name": "state", "Values": ["pending", "available"]},
+        ]
+    )["NatGateways"]
+    if existing:
+        return existing[0]["NatGatewayId"]
+
+    eip_1 = retry_on_throttle(ec2.allocate_address)(Domain="vpc")
+    try:
+        # No fixed ClientToken: a failed or deleted NAT gateway would pin it to an
+        # older allocation. botocore generates one per call, reused on its retries.
+        nat_1 = retry_on_throttle(ec2.create_nat_gateway)(
+            SubnetId=subnet_id,
+            AllocationId=eip_1["AllocationId"],
+            TagSpecifications=[
+                {
+                    "ResourceType": "natgateway",
+                    "Tags": [
+                        {"Key": "Name", "Value": "pf1-nat-1"}
+                    ]
+                }
             ]
-        }
-    ]
-)
+        )
+    except (ClientError, BotoCoreError):
+        # Do not leak the Elastic IP on every failed attempt. A failed release is
+        # only logged, so the caller still sees why the NAT gateway failed.
+        try:
+            retry_on_throttle(ec2.release_address)(AllocationId=eip_1["AllocationId"])
+        except (ClientError, BotoCoreError) as release_error:
+            LOGGER.warning("Could not release Elastic IP %s: %s", eip_1["AllocationId"], release_error)
+        raise
+    return nat_1["NatGateway"]["NatGatewayId"]
 
 
-print(
-    "NAT Gateways requested:",
-    nat_1["NatGateway"]["NatGatewayId"]
-)
+def validate_subnet_layout() -> None:
+    """Reject subnet CIDRs outside the VPC or overlapping each other before any API call."""
+    vpc_net = ipaddress.ip_network(VPC_CIDR)
+    subnet_nets = [ipaddress.ip_network(cidr) for cidr, _, _, _ in SUBNETS]
+    for net in subnet_nets:
+        if not net.subnet_of(vpc_net):
+            raise ValueError(f"Subnet {net} is not inside the VPC CIDR {vpc_net}.")
+    for index, net in enumerate(subnet_nets):
+        for other in subnet_nets[index + 1:]:
+            if net.overlaps(other):
+                raise ValueError(f"Subnets {net} and {other} overlap.")
+
+
+def provision(ec2) -> dict:
+    """Create (or reuse) the whole topology and return the resource IDs."""
+    validate_subnet_layout()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # The AZ lookup does not depend on the VPC, so it runs while the VPC is
+        # being looked up or created.
+        azs_future = executor.submit(get_azs, ec2)
+        vpc_id = create_vpc(ec2)
+
+        # Everything in this wave only needs the VPC ID.
+        dns_futures = [
+            executor.submit(enable_dns_support, ec2, vpc_id),
+            executor.submit(enable_dns_hostnames, ec2, vpc_id),
+        ]
+        igw_future = executor.submit(create_igw, ec2, vpc_id)
+        azs = azs_future.result()
+        needed = max(az_index for _, az_index, _, _ in SUBNETS) + 1
+        if len(azs) < needed:
+            raise ValueError(f"SUBNETS needs {needed} availability zones but only {len(azs)} are usable.")
+
+        # All subnets are created at once; the pool bounds how many calls are in flight.
+        subnet_futures = [
+            executor.submit(
+                create_subnet, ec2, vpc_id, cidr, azs[az_index], name, tier
+            )
+            for cidr, az_index, name, tier in SUBNETS
+        ]
+        subnet_ids = [future.result() for future in subnet_futures]
+        subnet_1_id = subnet_ids[0]
+        # One waiter polls every subnet in the same DescribeSubnets call.
+        wait_until(ec2, "subnet_available", "Subnets", SubnetIds=subnet_ids)
+        LOGGER.info("Subnets: %s", " ".join(subnet_ids))
+
+        for future in dns_futures:
+            future.result()
+        LOGGER.info("DNS enabled")
+
+        igw_id = igw_future.result()
+        # NAT gateways take the longest, so start it as soon as the public subnet
+        # exists and the IGW is attached (a public NAT fails without one).
+        nat_future = executor.submit(create_nat_gateway, ec2, subnet_1_id)
+        rt_future = executor.submit(create_public_route_table, ec2, vpc_id, igw_id, subnet_1_id)
+        sg_future = executor.submit(create_public_sg, ec2, vpc_id)
+        public_ip_future = executor.submit(enable_public_ip, ec2, subnet_1_id)
+        public_rt_id = rt_future.result()
+        public_sg_id = sg_future.result()
+        public_ip_future.result()
+        nat_id = nat_future.result()
+
+    LOGGER.info("NAT Gateways requested: %s", nat_id)
+
+    return {
+        "vpc_id": vpc_id,
+        "igw_id": igw_id,
+        "subnet_ids": subnet_ids,
+        "public_route_table_id": public_rt_id,
+        "public_security_group_id": public_sg_id,
+        "nat_gateway_id": nat_id,
+    }
+
+
+def handler(event, context) -> dict:
+    """
+    AWS Lambda entry point (handler: create_vpc.handler). Running next to the EC2
+    control plane in the same region keeps every call's round-trip short. The event
+    is ignored; the result is the same ID mapping the CLI prints.
+    """
+    # The Lambda runtime's root handler ships records to CloudWatch Logs.
+    LOGGER.setLevel(logging.INFO)
+    return provision(SESSION.client("ec2", config=BOTO_CONFIG))
+
+
+def main() -> None:
+    # boto3 clients are thread-safe, so one client serves all worker threads.
+    ec2 = SESSION.client("ec2", config=BOTO_CONFIG)
+    result = provision(ec2)
+    # Progress is logged to stderr; stdout carries only this line for calling scripts.
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    log_listener = start_log_listener()
+    try:
+        try:
+            main()
+        finally:
+            # Flush queued progress lines before any error message or traceback.
+            log_listener.stop()
+    except (ClientError, RuntimeError, ValueError) as error:
+        print(f"AWS error: {error}", file=sys.stderr)
+        raise SystemExit(1)
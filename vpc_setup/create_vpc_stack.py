@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Provision the same pf1 VPC topology as create_vpc.py, but as a single
+CloudFormation stack.
+
+CloudFormation creates the resource graph server-side (in parallel where the
+dependencies allow it) and rolls back and deletes the whole stack if any
+resource fails, so nothing is leaked on partial failure. The subnets take their
+zone from Fn::GetAZs, so no DescribeAvailabilityZones call is made client-side.
+The script submits the template, waits for CREATE_COMPLETE and prints the
+physical IDs of the resources.
+
+Example:
+    python vpc_setup/create_vpc_stack.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, WaiterError
+
+REGION = "eu-central-1"
+DEFAULT_STACK_NAME = "pf1-vpc"
+
+BOTO_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+TEMPLATE = """\
+AWSTemplateFormatVersion: "2010-09-09"
+Description: pf1 VPC with a public and a private subnet, IGW, public SG and NAT gateway.
+
+Resources:
+  Vpc:
+    Type: AWS::EC2::VPC
+    Properties:
+      CidrBlock: 10.0.0.0/16
+      EnableDnsSupport: true
+      EnableDnsHostnames: true
+      Tags:
+        - {Key: Name, Value: pf1-vpc}
+
+  InternetGateway:
+    Type: AWS::EC2::InternetGateway
+    Properties:
+      Tags:
+        - {Key: Name, Value: pf1-igw}
+
+  GatewayAttachment:
+    Type: AWS::EC2::VPCGatewayAttachment
+    Properties:
+      VpcId: !Ref Vpc
+      InternetGatewayId: !Ref InternetGateway
+
+  PublicSubnet:
+    Type: AWS::EC2::Subnet
+    Properties:
+      VpcId: !Ref Vpc
+      CidrBlock: 10.0.1.0/24
+      AvailabilityZone: !Select [0, !GetAZs ""]
+      MapPublicIpOnLaunch: true
+      Tags:
+        - {Key: Name, Value: pf1-subnet-1}
+        - {Key: Tier, Value: public}
+
+  PrivateSubnet:
+    Type: AWS::EC2::Subnet
+    Properties:
+      VpcId: !Ref Vpc
+      CidrBlock: 10.0.2.0/24
+      AvailabilityZone: !Select [0, !GetAZs ""]
+      Tags:
+        - {Key: Name, Value: pf1-subnet-2}
+        - {Key: Tier, Value: private}
+
+  PublicRouteTable:
+    Type: AWS::EC2::RouteTable
+    Properties:
+      VpcId: !Ref Vpc
+      Tags:
+        - {Key: Name, Value: pf1-public-rt}
+
+  PublicDefaultRoute:
+    Type: AWS::EC2::Route
+    DependsOn: GatewayAttachment
+    Properties:
+      RouteTableId: !Ref PublicRouteTable
+      DestinationCidrBlock: 0.0.0.0/0
+      GatewayId: !Ref InternetGateway
+
+  PublicSubnetRouteTableAssociation:
+    Type: AWS::EC2::SubnetRouteTableAssociation
+    Properties:
+      SubnetId: !Ref PublicSubnet
+      RouteTableId: !Ref PublicRouteTable
+
+  PublicSecurityGroup:
+    Type: AWS::EC2::SecurityGroup
+    Properties:
+      GroupName: pf1-public-sg
+      GroupDescription: Public access for subnet_1 resources
+      VpcId: !Ref Vpc
+      SecurityGroupIngress:
+        - {IpProtocol: tcp, FromPort: 22, ToPort: 22, CidrIp: 0.0.0.0/0, Description: SSH from internet}
+        - {IpProtocol: tcp, FromPort: 80, ToPort: 80, CidrIp: 0.0.0.0/0, Description: HTTP from internet}
+        - {IpProtocol: tcp, FromPort: 443, ToPort: 443, CidrIp: 0.0.0.0/0, Description: HTTPS from internet}
+      Tags:
+        - {Key: Name, Value: pf1-public-sg}
+
+  NatEip:
+    Type: AWS::EC2::EIP
+    DependsOn: GatewayAttachment
+    Properties:
+      Domain: vpc
+
+  NatGateway:
+    Type: AWS::EC2::NatGateway
+    Properties:
+      SubnetId: !Ref PublicSubnet
+      AllocationId: !GetAtt NatEip.AllocationId
+      Tags:
+        - {Key: Name, Value: pf1-nat-1}
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create the pf1 VPC as a CloudFormation stack.")
+    parser.add_argument("--stack-name", default=DEFAULT_STACK_NAME, help="CloudFormation stack name.")
+    parser.add_argument("--region", default=REGION, help="AWS region (default: %(default)s)")
+    return parser.parse_args()
+
+
+def create_stack(cfn, stack_name: str) -> None:
+    try:
+        # OnFailure=DELETE tears a failed stack down completely instead of leaving
+        # it in ROLLBACK_COMPLETE, which would block a rerun under the same name.
+        cfn.create_stack(StackName=stack_name, TemplateBody=TEMPLATE, OnFailure="DELETE")
+        print(f"Stack '{stack_name}' submitted; waiting for CREATE_COMPLETE...")
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] != "AlreadyExistsException":
+            raise
+        print(f"Stack '{stack_name}' already exists; waiting for it to settle.")
+
+    try:
+        cfn.get_waiter("stack_create_complete").wait(
+            StackName=stack_name,
+            WaiterConfig={"Delay": 10, "MaxAttempts": 90},
+        )
+    except WaiterError as exc:
+        raise RuntimeError(f"Stack '{stack_name}' did not reach CREATE_COMPLETE: {exc}") from exc
+
+
+def print_stack_resources(cfn, stack_name: str) -> None:
+    resources = cfn.describe_stack_resources(StackName=stack_name)["StackResources"]
+    for resource in resources:
+        print(f"{resource['LogicalResourceId']}: {resource['PhysicalResourceId']}")
+
+
+def main() -> None:
+    args = parse_args()
+    cfn = boto3.client("cloudformation", region_name=args.region, config=BOTO_CONFIG)
+
+    create_stack(cfn, args.stack_name)
+    print_stack_resources(cfn, args.stack_name)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (ClientError, RuntimeError) as error:
+        print(f"AWS error: {error}", file=sys.stderr)
+        raise SystemExit(1)